@@ -0,0 +1,29 @@
+"""Python client for the HEYRY Tools schema registry.
+
+Schemas are located through ``index.json`` and loaded on first use; parsed
+schemas and compiled validators are kept in LRU caches.
+"""
+
+from __future__ import annotations
+
+from heyry_schemas.registry import (
+  REGISTRY_ROOT,
+  SchemaNotFoundError,
+  clear_caches,
+  get_schema,
+  get_validator,
+  schema_ids,
+  validate,
+)
+from heyry_schemas.versions import resolve_version
+
+__all__ = [
+  "REGISTRY_ROOT",
+  "SchemaNotFoundError",
+  "clear_caches",
+  "get_schema",
+  "get_validator",
+  "resolve_version",
+  "schema_ids",
+  "validate",
+]
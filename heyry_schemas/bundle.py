@@ -0,0 +1,286 @@
+"""Single-file registry bundles with constant-time lookup by ``$id``.
+
+Layout (little-endian)::
+
+  header   magic, format version, slot count, entry count, table offset,
+           index offset/length and SHA-256 of the embedded index.json
+  entries  per schema: id length, data length, SHA-256 of data, id, data
+  index    the registry index.json, verbatim
+  table    open-addressing hash table of (id hash, entry offset) slots
+
+Readers memory-map the file, hash the requested ``$id`` to a slot, and probe
+linearly, so a lookup touches one slot run and one entry regardless of the
+bundle size. Nothing is unpacked.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator
+
+MAGIC = b"HEYRYBDL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIIIQQQ32s")
+SLOT = struct.Struct("<QQ")
+ENTRY = struct.Struct("<II32s")
+MAX_ID_LENGTH = 2048
+DEFAULT_OUTPUT = Path(__file__).resolve().parents[1] / "dist" / "heyry-schemas.bundle"
+
+
+class BundleError(ValueError):
+  """Raised when a bundle is malformed or fails integrity checks."""
+
+
+def _key_hash(schema_id: str) -> int:
+  return int.from_bytes(hashlib.sha256(schema_id.encode("utf-8")).digest()[:8], "little")
+
+
+def _slot_count(entries: int) -> int:
+  count = 1
+  while count < entries * 2:
+    count <<= 1
+  return count
+
+
+def write_bundle(path: Path, schemas: dict[str, bytes], index: bytes) -> None:
+  """Write ``schemas`` (``$id`` -> raw JSON bytes) and ``index`` to ``path``."""
+  slot_count = _slot_count(len(schemas))
+  slots = [(0, 0)] * slot_count
+  body = bytearray()
+  offset = HEADER.size
+
+  for schema_id in sorted(schemas):
+    data = schemas[schema_id]
+    encoded_id = schema_id.encode("utf-8")
+    key = _key_hash(schema_id)
+    slot = key & (slot_count - 1)
+    while slots[slot][1]:
+      slot = (slot + 1) & (slot_count - 1)
+    slots[slot] = (key, offset + len(body))
+    body += ENTRY.pack(len(encoded_id), len(data), hashlib.sha256(data).digest())
+    body += encoded_id
+    body += data
+
+  index_offset = offset + len(body)
+  table_offset = index_offset + len(index)
+  header = HEADER.pack(
+    MAGIC,
+    FORMAT_VERSION,
+    slot_count,
+    len(schemas),
+    0,
+    table_offset,
+    index_offset,
+    len(index),
+    hashlib.sha256(index).digest(),
+  )
+
+  path.parent.mkdir(parents=True, exist_ok=True)
+  temporary = path.with_name(f"{path.name}.tmp")
+  with temporary.open("wb") as handle:
+    handle.write(header)
+    handle.write(body)
+    handle.write(index)
+    for key, entry_offset in slots:
+      handle.write(SLOT.pack(key, entry_offset))
+  temporary.replace(path)
+
+
+class RegistryBundle:
+  """Read-only, memory-mapped view of a bundle written by :func:`write_bundle`."""
+
+  def __init__(self, path: Path) -> None:
+    self.path = Path(path)
+    with self.path.open("rb") as handle:
+      if os.fstat(handle.fileno()).st_size < HEADER.size:
+        raise BundleError(f"{self.path} is too small to be a registry bundle")
+      self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      self._read_header()
+    except BundleError:
+      self._map.close()
+      raise
+
+  def _read_header(self) -> None:
+    (
+      magic,
+      version,
+      self.slot_count,
+      self.entry_count,
+      _,
+      self.table_offset,
+      self.index_offset,
+      self.index_length,
+      self.index_digest,
+    ) = HEADER.unpack_from(self._map, 0)
+    if magic != MAGIC:
+      raise BundleError(f"{self.path} is not a registry bundle")
+    if version != FORMAT_VERSION:
+      raise BundleError(f"{self.path} uses unsupported bundle format {version}")
+    if not self.slot_count or self.slot_count & (self.slot_count - 1):
+      raise BundleError(f"{self.path} declares {self.slot_count} slots, which is not a power of two")
+    if self.table_offset + self.slot_count * SLOT.size > len(self._map):
+      raise BundleError(f"{self.path} is truncated")
+    if not HEADER.size <= self.index_offset <= self.index_offset + self.index_length <= self.table_offset:
+      raise BundleError(f"{self.path} has an inconsistent header")
+
+  def close(self) -> None:
+    self._map.close()
+
+  def __enter__(self) -> RegistryBundle:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    return self.entry_count
+
+  def __contains__(self, schema_id: object) -> bool:
+    return isinstance(schema_id, str) and self._find(schema_id) is not None
+
+  def _entry(self, offset: int) -> tuple[str, int, int, bytes]:
+    """Decode the entry at ``offset``; raises ``BundleError`` if it does not fit the entries region."""
+    if not HEADER.size <= offset <= self.index_offset - ENTRY.size:
+      raise BundleError(f"entry offset {offset} is outside the entries region")
+    id_length, data_length, digest = ENTRY.unpack_from(self._map, offset)
+    id_start = offset + ENTRY.size
+    data_start = id_start + id_length
+    if id_length > MAX_ID_LENGTH:
+      raise BundleError(f"entry at offset {offset} declares a {id_length}-byte id")
+    if data_start + data_length > self.index_offset:
+      raise BundleError(f"entry at offset {offset} extends past the entries region")
+    try:
+      schema_id = self._map[id_start:data_start].decode("utf-8")
+    except UnicodeDecodeError:
+      raise BundleError(f"entry at offset {offset} has an undecodable id") from None
+    return schema_id, data_start, data_length, digest
+
+  def _find(self, schema_id: str) -> tuple[int, int] | None:
+    key = _key_hash(schema_id)
+    mask = self.slot_count - 1
+    slot = key & mask
+    for _ in range(self.slot_count):
+      slot_key, offset = self._slot(slot)
+      if not offset:
+        return None
+      if slot_key == key:
+        entry_id, data_start, data_length, _ = self._entry(offset)
+        if entry_id == schema_id:
+          return data_start, data_length
+      slot = (slot + 1) & mask
+    return None
+
+  def get_bytes(self, schema_id: str) -> bytes:
+    """Return the raw JSON of ``schema_id``; raises ``KeyError`` if it is absent."""
+    found = self._find(schema_id)
+    if found is None:
+      raise KeyError(schema_id)
+    data_start, data_length = found
+    return self._map[data_start : data_start + data_length]
+
+  def load(self, schema_id: str) -> dict:
+    return json.loads(self.get_bytes(schema_id))
+
+  def index_bytes(self) -> bytes:
+    return self._map[self.index_offset : self.index_offset + self.index_length]
+
+  def index(self) -> dict:
+    return json.loads(self.index_bytes())
+
+  def _slot(self, slot: int) -> tuple[int, int]:
+    return SLOT.unpack_from(self._map, self.table_offset + slot * SLOT.size)
+
+  def ids(self) -> Iterator[str]:
+    for slot in range(self.slot_count):
+      _, offset = self._slot(slot)
+      if offset:
+        yield self._entry(offset)[0]
+
+  def verify(self) -> list[str]:
+    """Check every entry and the embedded index against their SHA-256 digests."""
+    problems: list[str] = []
+    if hashlib.sha256(self.index_bytes()).digest() != self.index_digest:
+      problems.append("index.json digest mismatch")
+
+    seen = 0
+    for slot in range(self.slot_count):
+      slot_key, offset = self._slot(slot)
+      if not offset:
+        continue
+      seen += 1
+      try:
+        schema_id, data_start, data_length, digest = self._entry(offset)
+      except BundleError as exc:
+        problems.append(f"slot {slot}: {exc}")
+        continue
+      if _key_hash(schema_id) != slot_key:
+        # A corrupted id length yields a garbage id, so identify the entry by slot instead.
+        problems.append(f"slot {slot}: stored id does not match the slot hash")
+        continue
+      if hashlib.sha256(self._map[data_start : data_start + data_length]).digest() != digest:
+        problems.append(f"{schema_id}: content digest mismatch")
+      try:
+        reachable = self._find(schema_id) == (data_start, data_length)
+      except BundleError:
+        reachable = False
+      if not reachable:
+        problems.append(f"{schema_id}: not reachable from its hash slot")
+
+    if seen != self.entry_count:
+      problems.append(f"table holds {seen} entries but the header declares {self.entry_count}")
+    return problems
+
+
+def build_from_registry(root: Path, output: Path) -> int:
+  """Bundle every schema listed in ``root``/index.json; return the entry count."""
+  index = (root / "index.json").read_bytes()
+  schemas = {entry["id"]: (root / entry["path"]).read_bytes() for entry in json.loads(index)["schemas"]}
+  write_bundle(output, schemas, index)
+  return len(schemas)
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Build or verify a single-file HEYRY schema registry bundle.")
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  build = commands.add_parser("build", help="Pack every schema listed in index.json into one bundle file.")
+  build.add_argument(
+    "--output",
+    type=Path,
+    default=DEFAULT_OUTPUT,
+    help=f"Bundle file to write (default: {DEFAULT_OUTPUT.relative_to(DEFAULT_OUTPUT.parents[1])}).",
+  )
+
+  verify = commands.add_parser("verify", help="Check a bundle's per-entry hashes.")
+  verify.add_argument("bundle", type=Path, help="Bundle file to verify.")
+  return parser.parse_args()
+
+
+def main() -> int:
+  from heyry_schemas.registry import REGISTRY_ROOT
+
+  args = parse_args()
+  if args.command == "build":
+    count = build_from_registry(REGISTRY_ROOT, args.output)
+    print(f"Wrote {count} schema(s) to {args.output}")
+    return 0
+
+  with RegistryBundle(args.bundle) as bundle:
+    problems = bundle.verify()
+    for problem in problems:
+      print(f"FAIL {problem}")
+    if problems:
+      return 1
+    print(f"{args.bundle}: {len(bundle)} schema(s) verified")
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
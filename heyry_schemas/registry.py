@@ -0,0 +1,114 @@
+"""Lazy, cached access to registry schemas and validators."""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+  from jsonschema import Draft7Validator
+
+  from heyry_schemas.bundle import RegistryBundle
+
+ROOT_ENV_VAR = "HEYRY_SCHEMAS_ROOT"
+BUNDLE_ENV_VAR = "HEYRY_SCHEMAS_BUNDLE"
+REGISTRY_ROOT = Path(os.environ.get(ROOT_ENV_VAR) or Path(__file__).resolve().parents[1])
+INDEX_PATH = REGISTRY_ROOT / "index.json"
+SCHEMA_CACHE_SIZE = 256
+VALIDATOR_CACHE_SIZE = 64
+
+
+class SchemaNotFoundError(LookupError):
+  """Raised when a schema ``$id`` is not listed in the registry index."""
+
+
+@lru_cache(maxsize=1)
+def _bundle() -> RegistryBundle | None:
+  """Return the bundle named by ``HEYRY_SCHEMAS_BUNDLE``, if any, instead of the checkout."""
+  path = os.environ.get(BUNDLE_ENV_VAR)
+  if not path:
+    return None
+
+  from heyry_schemas.bundle import RegistryBundle
+
+  return RegistryBundle(Path(path))
+
+
+@lru_cache(maxsize=1)
+def _index() -> dict[str, Path]:
+  with INDEX_PATH.open("r", encoding="utf-8") as handle:
+    payload = json.load(handle)
+  return {entry["id"]: REGISTRY_ROOT / entry["path"] for entry in payload["schemas"]}
+
+
+def schema_ids() -> list[str]:
+  """Return every schema ``$id`` listed in the registry index."""
+  bundle = _bundle()
+  if bundle is not None:
+    return sorted(bundle.ids())
+  return sorted(_index())
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _load_schema(schema_id: str) -> dict:
+  schema_id = schema_id.split("#", 1)[0]
+  bundle = _bundle()
+  if bundle is not None:
+    try:
+      return bundle.load(schema_id)
+    except KeyError:
+      raise SchemaNotFoundError(f"Unknown schema: {schema_id}") from None
+
+  path = _index().get(schema_id)
+  if path is None:
+    raise SchemaNotFoundError(f"Unknown schema: {schema_id}")
+  with path.open("r", encoding="utf-8") as handle:
+    return json.load(handle)
+
+
+def get_schema(schema_id: str) -> dict:
+  """Return a copy of the schema registered under ``schema_id``."""
+  return copy.deepcopy(_load_schema(schema_id))
+
+
+@lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
+def get_validator(schema_id: str) -> Draft7Validator:
+  """Return a compiled validator for ``schema_id`` whose ``$ref``s resolve through the registry."""
+  from jsonschema import Draft7Validator, RefResolver
+
+  schema = _load_schema(schema_id)
+  resolver = RefResolver(
+    base_uri=schema_id,
+    referrer=schema,
+    handlers={"http": _load_schema, "https": _load_schema},
+  )
+  return Draft7Validator(schema, resolver=resolver)
+
+
+def validate(document: dict, schema_id: str | None = None) -> None:
+  """Validate ``document`` against ``schema_id`` (defaults to its ``$schema``).
+
+  Raises ``jsonschema.ValidationError`` for invalid documents.
+  """
+  schema_id = schema_id or document.get("$schema")
+  if not schema_id:
+    raise ValueError("Document has no $schema property and no schema_id was given.")
+  get_validator(schema_id).validate(document)
+
+
+def clear_caches() -> None:
+  """Drop cached schemas, validators, indexes, and any open bundle (e.g. after regenerating the registry)."""
+  get_validator.cache_clear()
+  _load_schema.cache_clear()
+  _index.cache_clear()
+  from heyry_schemas.versions import _families
+
+  _families.cache_clear()
+  bundle = _bundle()
+  if bundle is not None:
+    bundle.close()
+  _bundle.cache_clear()
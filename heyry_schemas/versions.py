@@ -0,0 +1,88 @@
+"""Constant-time "latest compatible version" lookups backed by versions.json."""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from heyry_schemas.registry import REGISTRY_ROOT
+
+VERSIONS_PATH = REGISTRY_ROOT / "versions.json"
+STATUSES = ("draft", "in_review", "approved", "deprecated")
+
+_RANGE = re.compile(r"^(?P<operator>[\^~]?)(?P<major>0|[1-9]\d*)(?:\.(?P<minor>0|[1-9]\d*))?(?:\.(?P<patch>0|[1-9]\d*))?$")
+
+
+@lru_cache(maxsize=1)
+def _families() -> dict[str, dict]:
+  with VERSIONS_PATH.open("r", encoding="utf-8") as handle:
+    return json.load(handle)["families"]
+
+
+def _release_key(version: str) -> tuple[int, ...]:
+  return tuple(int(part) for part in version.split("+", 1)[0].split("."))
+
+
+def _select(record: dict, spec: str) -> tuple[dict[str, str], tuple[int, ...]] | str | None:
+  """Map ``spec`` to a precomputed status table and a lower bound, or to an exact version."""
+  if spec in ("", "*", "latest"):
+    return record["latest"], ()
+  if spec in record["versions"]:
+    return spec
+
+  match = _RANGE.match(spec)
+  if match is None:
+    raise ValueError(f"Unsupported version range: {spec!r}")
+
+  operator = match["operator"]
+  major = int(match["major"])
+  minor = None if match["minor"] is None else int(match["minor"])
+  patch = None if match["patch"] is None else int(match["patch"])
+  floor = (major, minor or 0, patch or 0)
+
+  if minor is None:
+    return record["latest_by_major"].get(str(major), {}), floor
+  if operator == "~" or (operator == "" and patch is None):
+    return record["latest_by_minor"].get(f"{major}.{minor}", {}), floor
+  if operator == "^":
+    if major > 0:
+      return record["latest_by_major"].get(str(major), {}), floor
+    if minor > 0 or patch is None:
+      return record["latest_by_minor"].get(f"0.{minor}", {}), floor
+  return f"{major}.{minor}.{patch}"
+
+
+def resolve_version(family: str, spec: str = "*", statuses: Iterable[str] | None = None) -> dict[str, str] | None:
+  """Return the newest version of ``family`` matching ``spec``, or ``None``.
+
+  ``family`` is ``<domain>/<schema-name>`` (e.g. ``documents/specification``).
+  ``spec`` accepts ``*``, an exact version, ``^1.2``, ``~1.2.3``, ``1`` or
+  ``1.2``. ``statuses`` restricts the result to those lifecycle statuses,
+  e.g. ``("approved",)`` to exclude draft and deprecated schemas. Every lookup
+  reads a precomputed table, so its cost does not depend on the registry size.
+  """
+  record = _families().get(family)
+  if record is None:
+    return None
+
+  allowed = STATUSES if statuses is None else tuple(statuses)
+  selected = _select(record, spec)
+  if selected is None:
+    return None
+
+  if isinstance(selected, str):
+    entry = record["versions"].get(selected)
+    if entry is None or entry["status"] not in allowed:
+      return None
+    return {"version": selected, **entry}
+
+  table, floor = selected
+  candidates = [table[status] for status in allowed if status in table]
+  if not candidates:
+    return None
+  newest = max(candidates, key=_release_key)
+  if _release_key(newest) < floor:
+    return None
+  return {"version": newest, **record["versions"][newest]}
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""Generate synthetic documents for a registry schema as NDJSON, for load testing.
+
+Documents honour ``type``, ``required``, ``enum``/``const``, string and array
+length limits, ``uniqueItems``, numeric bounds, ``pattern``s, ``allOf``
+compositions and ``$ref``s, and HEYRY IDs carry a correct checksum. Output is
+reproducible for a given ``--seed``. With ``--invalid-rate``, that share of
+documents receives exactly one schema-detectable defect (``--annotate`` reports
+which one and where).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urldefrag, urljoin
+
+from generate_heyry_id import _format, _generate_body
+from json_io import dumps_line, load_json
+from schema_store import LazySchemaStore
+
+try:  # Python 3.11+
+  import re._constants as sre_constants
+  import re._parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+  import sre_constants
+  import sre_parse
+
+WORDS = (
+  "registry", "schema", "document", "version", "owner", "release", "review", "scope", "metric",
+  "latency", "record", "export", "import", "batch", "serial", "order", "customer", "product",
+  "assembly", "policy", "procedure", "control", "audit", "signal", "sensor", "config", "target",
+  "workflow", "approval", "deploy", "monitor", "archive", "index", "payload", "contract",
+)
+PRINTABLE = [chr(code) for code in range(0x20, 0x7F)]
+EPOCH = date(2020, 1, 1)
+MUTATIONS = ("missing-required", "additional-property", "max-length", "min-length", "enum", "type", "min-items")
+WRONG_TYPE_VALUES = {"string": 0, "integer": "0", "number": "0", "boolean": "false", "array": {}, "object": []}
+
+
+class _Mutation:
+  """Tracks candidate defect sites and applies a defect at the chosen one."""
+
+  def __init__(self, target: int | None) -> None:
+    self.target = target
+    self.sites = 0
+    self.applied: tuple[str, str] | None = None
+
+  def claim(self) -> bool:
+    """Register a site; return True if the defect belongs here."""
+    hit = self.target is not None and self.sites == self.target
+    self.sites += 1
+    return hit
+
+
+class DocumentGenerator:
+  def __init__(
+    self,
+    store: LazySchemaStore,
+    schema_id: str,
+    max_items: int = 4,
+    max_string_length: int = 80,
+    optional_rate: float = 0.5,
+  ) -> None:
+    self.store = store
+    self.schema_id = schema_id
+    self.max_items = max_items
+    self.max_string_length = max_string_length
+    self.optional_rate = optional_rate
+    self._merged: dict[int, tuple[dict, str, dict]] = {}
+    self._patterns: dict[str, object] = {}
+
+  # Schema handling ---------------------------------------------------------
+
+  def _resolve(self, schema: object, base: str) -> tuple[object, str]:
+    while isinstance(schema, dict) and "$ref" in schema:
+      url = urljoin(base, schema["$ref"])
+      base, fragment = urldefrag(url)
+      schema = self.store[base]
+      for token in filter(None, fragment.split("/")):
+        token = token.replace("~1", "/").replace("~0", "~")
+        schema = schema[int(token)] if isinstance(schema, list) else schema[token]
+    return schema, base
+
+  def _merge(self, schema: object, base: str) -> tuple[dict, str]:
+    """Resolve ``$ref`` and fold ``allOf`` branches into one schema."""
+    key = id(schema)
+    cached = self._merged.get(key)
+    if cached is not None and cached[2] is schema:
+      return cached[0], cached[1]
+
+    resolved, resolved_base = self._resolve(schema, base)
+    if not isinstance(resolved, dict):
+      merged: dict = {} if resolved is not False else {"not": {}}
+    elif "allOf" not in resolved:
+      merged = resolved
+    else:
+      merged = {key: value for key, value in resolved.items() if key != "allOf"}
+      for branch in resolved["allOf"]:
+        part, _ = self._merge(branch, resolved_base)
+        for name, value in part.items():
+          if name == "properties":
+            properties = dict(merged.get("properties", {}))
+            for prop, prop_schema in value.items():
+              properties[prop] = {"allOf": [properties[prop], prop_schema]} if prop in properties else prop_schema
+            merged["properties"] = properties
+          elif name == "required":
+            merged["required"] = list(dict.fromkeys([*merged.get("required", []), *value]))
+          elif name in ("minLength", "minItems", "minimum", "minProperties") and name in merged:
+            merged[name] = max(merged[name], value)
+          elif name in ("maxLength", "maxItems", "maximum", "maxProperties") and name in merged:
+            merged[name] = min(merged[name], value)
+          else:
+            merged.setdefault(name, value)
+
+    self._merged[key] = (merged, resolved_base, schema)
+    return merged, resolved_base
+
+  # Value generation --------------------------------------------------------
+
+  def generate(self, rng: random.Random, mutation: _Mutation | None = None) -> object:
+    root = self.store[self.schema_id]
+    document = self._value(rng, root, self.schema_id, "", mutation or _Mutation(None))
+    merged, _ = self._merge(root, self.schema_id)
+    # Tag documents with their schema, as the registry examples are, unless the schema declares "$schema" itself.
+    if isinstance(document, dict) and "$schema" not in merged.get("properties", {}):
+      if merged.get("additionalProperties", True) is not False:
+        document = {"$schema": self.schema_id, **document}
+    return document
+
+  def _value(self, rng: random.Random, schema: object, base: str, pointer: str, mutation: _Mutation) -> object:
+    schema, base = self._merge(schema, base)
+    for keyword in ("anyOf", "oneOf"):
+      if keyword in schema:
+        branch, _ = self._merge(rng.choice(schema[keyword]), base)
+        schema = {**{key: value for key, value in schema.items() if key != keyword}, **branch}
+
+    if "const" in schema:
+      return schema["const"]
+    if "enum" in schema:
+      if mutation.claim():
+        mutation.applied = ("enum", pointer)
+        return f"not-{rng.choice(WORDS)}-{rng.randrange(10**6)}"
+      return rng.choice(schema["enum"])
+
+    kind = self._type(rng, schema)
+    if kind in WRONG_TYPE_VALUES and "type" in schema and mutation.claim():
+      mutation.applied = ("type", pointer)
+      return WRONG_TYPE_VALUES[kind]
+
+    if kind == "object":
+      return self._object(rng, schema, base, pointer, mutation)
+    if kind == "array":
+      return self._array(rng, schema, base, pointer, mutation)
+    if kind == "string":
+      return self._string(rng, schema, pointer, mutation)
+    if kind == "integer":
+      return int(self._number(rng, schema, integer=True))
+    if kind == "number":
+      return self._number(rng, schema, integer=False)
+    if kind == "boolean":
+      return rng.random() < 0.5
+    return None
+
+  def _type(self, rng: random.Random, schema: dict) -> str:
+    kind = schema.get("type")
+    if isinstance(kind, list):
+      return rng.choice([item for item in kind if item != "null"] or kind)
+    if kind is not None:
+      return kind
+    if "properties" in schema or "required" in schema:
+      return "object"
+    if "items" in schema:
+      return "array"
+    if any(key in schema for key in ("pattern", "minLength", "maxLength", "format")):
+      return "string"
+    if any(key in schema for key in ("minimum", "maximum", "multipleOf")):
+      return "number"
+    return "string"
+
+  def _object(self, rng: random.Random, schema: dict, base: str, pointer: str, mutation: _Mutation) -> dict:
+    properties = schema.get("properties", {})
+    required = list(schema.get("required", []))
+    result: dict[str, object] = {}
+    dropped = None
+    if required and mutation.claim():
+      dropped = rng.choice(required)
+      mutation.applied = ("missing-required", f"{pointer}/{dropped}")
+
+    for name, subschema in properties.items():
+      if name == dropped or (name not in required and rng.random() >= self.optional_rate):
+        continue
+      if name == "$schema" and pointer == "" and not {"const", "enum"}.intersection(self._merge(subschema, base)[0]):
+        result[name] = self.schema_id
+        continue
+      result[name] = self._value(rng, subschema, base, f"{pointer}/{name}", mutation)
+    for name in required:
+      if name not in result and name != dropped:
+        result[name] = self._value(rng, {}, base, f"{pointer}/{name}", mutation)
+
+    if schema.get("additionalProperties", True) is False and mutation.claim():
+      mutation.applied = ("additional-property", f"{pointer}/x-unexpected")
+      result["x-unexpected"] = True
+    return result
+
+  def _array(self, rng: random.Random, schema: dict, base: str, pointer: str, mutation: _Mutation) -> list:
+    minimum = schema.get("minItems", 0)
+    maximum = min(schema.get("maxItems", minimum + self.max_items), minimum + self.max_items)
+    count = rng.randint(minimum, max(minimum, maximum))
+    if minimum > 0 and mutation.claim():
+      mutation.applied = ("min-items", pointer)
+      return []
+
+    items = schema.get("items", {})
+    if isinstance(items, list):
+      return [self._value(rng, item, base, f"{pointer}/{index}", mutation) for index, item in enumerate(items)]
+
+    result: list[object] = []
+    seen: set[str] = set()
+    attempts = 0
+    while len(result) < count and attempts < count * 10:
+      attempts += 1
+      value = self._value(rng, items, base, f"{pointer}/{len(result)}", mutation)
+      if schema.get("uniqueItems"):
+        key = dumps_line(value)
+        if key in seen:
+          continue
+        seen.add(key)
+      result.append(value)
+    return result
+
+  def _string(self, rng: random.Random, schema: dict, pointer: str, mutation: _Mutation) -> str:
+    minimum = schema.get("minLength", 0)
+    maximum = schema.get("maxLength")
+    if maximum is not None and mutation.claim():
+      mutation.applied = ("max-length", pointer)
+      return "x" * (maximum + 1)
+    if minimum > 0 and mutation.claim():
+      mutation.applied = ("min-length", pointer)
+      return "x" * (minimum - 1)
+
+    value_format = schema.get("format")
+    if value_format == "heyry-id-v1":
+      return _format(_generate_body(rng.choice))
+    if value_format == "heyry-semver-v1":
+      return f"{rng.randrange(4)}.{rng.randrange(20)}.{rng.randrange(50)}"
+    if value_format == "date":
+      return (EPOCH + timedelta(days=rng.randrange(3650))).isoformat()
+    if value_format == "date-time":
+      return f"{(EPOCH + timedelta(days=rng.randrange(3650))).isoformat()}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00Z"
+    if value_format in ("uri", "url"):
+      return f"https://example.com/{rng.choice(WORDS)}/{rng.randrange(10**6)}"
+    if value_format == "email":
+      return f"{rng.choice(WORDS)}.{rng.randrange(10**4)}@example.com"
+
+    upper = maximum if maximum is not None else minimum + self.max_string_length
+    upper = min(upper, max(minimum, self.max_string_length))
+    if "pattern" in schema:
+      return self._pattern_string(rng, schema["pattern"], minimum, max(minimum, upper))
+    return self._text(rng, rng.randint(minimum, max(minimum, upper)))
+
+  def _text(self, rng: random.Random, length: int) -> str:
+    # Every word is at least five characters, so this always covers ``length``.
+    text = " ".join(rng.choices(WORDS, k=length // 5 + 1))[:length]
+    return text[:-1] + "." if text.endswith(" ") else text
+
+  def _number(self, rng: random.Random, schema: dict, integer: bool) -> float:
+    minimum = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+    maximum = schema.get("maximum", schema.get("exclusiveMaximum", minimum + 1000))
+    if "exclusiveMinimum" in schema and "minimum" not in schema:
+      minimum += 1 if integer else 1e-9
+    if "exclusiveMaximum" in schema and "maximum" not in schema:
+      maximum -= 1 if integer else 1e-9
+    if "multipleOf" in schema:
+      step = schema["multipleOf"]
+      low, high = -(-minimum // step), maximum // step
+      return rng.randint(int(low), int(max(low, high))) * step
+    if integer:
+      return rng.randint(int(-(-minimum // 1)), int(maximum // 1))
+    return round(rng.uniform(minimum, maximum), 6)
+
+  # Pattern support -----------------------------------------------------------
+
+  def _pattern_string(self, rng: random.Random, pattern: str, minimum: int, maximum: int) -> str:
+    parsed = self._patterns.get(pattern)
+    if parsed is None:
+      parsed = self._patterns[pattern] = sre_parse.parse(pattern)
+
+    value = ""
+    for _ in range(50):
+      value = _render_pattern(rng, parsed, {})
+      if minimum <= len(value) <= maximum and re.search(pattern, value):
+        return value
+    return value
+
+
+def _render_pattern(rng: random.Random, parsed: object, groups: dict[int, str]) -> str:
+  parts: list[str] = []
+  for opcode, argument in parsed:
+    if opcode == sre_constants.LITERAL:
+      parts.append(chr(argument))
+    elif opcode == sre_constants.NOT_LITERAL:
+      parts.append(rng.choice([char for char in PRINTABLE if ord(char) != argument]))
+    elif opcode == sre_constants.ANY:
+      parts.append(rng.choice(PRINTABLE))
+    elif opcode == sre_constants.IN:
+      parts.append(rng.choice(_class_members(tuple(argument))))
+    elif opcode == sre_constants.BRANCH:
+      parts.append(_render_pattern(rng, rng.choice(argument[1]), groups))
+    elif opcode == sre_constants.SUBPATTERN:
+      group, _, _, subpattern = argument
+      text = _render_pattern(rng, subpattern, groups)
+      if group is not None:
+        groups[group] = text
+      parts.append(text)
+    elif opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+      low, high, subpattern = argument
+      high = low + 3 if high == sre_constants.MAXREPEAT else high
+      parts.extend(_render_pattern(rng, subpattern, groups) for _ in range(rng.randint(low, high)))
+    elif opcode == sre_constants.GROUPREF:
+      parts.append(groups.get(argument, ""))
+    elif opcode == sre_constants.CATEGORY:
+      parts.append(rng.choice(_category_members(argument)))
+  return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _category_members(category: object) -> list[str]:
+  if category == sre_constants.CATEGORY_DIGIT:
+    return list("0123456789")
+  if category == sre_constants.CATEGORY_WORD:
+    return [char for char in PRINTABLE if char.isalnum() or char == "_"]
+  if category == sre_constants.CATEGORY_SPACE:
+    return [" "]
+  if category == sre_constants.CATEGORY_NOT_DIGIT:
+    return [char for char in PRINTABLE if not char.isdigit()]
+  if category == sre_constants.CATEGORY_NOT_WORD:
+    return [char for char in PRINTABLE if not (char.isalnum() or char == "_")]
+  return [char for char in PRINTABLE if char != " "]
+
+
+@lru_cache(maxsize=None)
+def _class_members(items: tuple) -> list[str]:
+  members: set[str] = set()
+  negate = False
+  for opcode, argument in items:
+    if opcode == sre_constants.NEGATE:
+      negate = True
+    elif opcode == sre_constants.LITERAL:
+      members.add(chr(argument))
+    elif opcode == sre_constants.RANGE:
+      members.update(chr(code) for code in range(argument[0], argument[1] + 1))
+    elif opcode == sre_constants.CATEGORY:
+      members.update(_category_members(argument))
+  if negate:
+    return [char for char in PRINTABLE if char not in members]
+  return sorted(members)
+
+
+def iter_documents(
+  generator: DocumentGenerator,
+  count: int,
+  seed: int,
+  invalid_rate: float = 0.0,
+) -> Iterator[tuple[object, tuple[str, str] | None]]:
+  """Yield ``(document, defect)`` pairs; ``defect`` is ``(kind, JSON pointer)`` or ``None``."""
+  master = random.Random(seed)
+  for _ in range(count):
+    document_seed = master.getrandbits(64)
+    make_invalid = invalid_rate > 0 and master.random() < invalid_rate
+    if not make_invalid:
+      yield generator.generate(random.Random(document_seed)), None
+      continue
+
+    # Count defect sites on a dry run, then regenerate with the same seed and one chosen site.
+    survey = _Mutation(None)
+    generator.generate(random.Random(document_seed), survey)
+    mutation = _Mutation(random.Random(document_seed ^ 0x5EED).randrange(max(1, survey.sites)))
+    document = generator.generate(random.Random(document_seed), mutation)
+    yield document, mutation.applied
+
+
+def resolve_schema_id(value: str, store: LazySchemaStore) -> str:
+  path = Path(value)
+  if path.suffix == ".json" and path.exists():
+    return load_json(path)["$id"]
+  store[value]
+  return value
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("schema", help="Schema $id or path to a *.schema.json file.")
+  parser.add_argument("-n", "--count", type=int, default=1, help="Number of documents to generate (default: 1).")
+  parser.add_argument("--seed", type=int, default=0, help="Seed for reproducible output (default: 0).")
+  parser.add_argument(
+    "--invalid-rate",
+    type=float,
+    default=0.0,
+    help="Share of documents (0-1) that receive exactly one schema violation (default: 0).",
+  )
+  parser.add_argument("--max-items", type=int, default=4, help="Extra array items beyond minItems (default: 4).")
+  parser.add_argument(
+    "--max-string-length",
+    type=int,
+    default=80,
+    help="Upper bound for free-text lengths unless minLength demands more (default: 80).",
+  )
+  parser.add_argument(
+    "--optional-rate",
+    type=float,
+    default=0.5,
+    help="Probability of emitting each optional property (default: 0.5).",
+  )
+  parser.add_argument(
+    "--annotate",
+    action="store_true",
+    help='Wrap each line as {"valid", "defect", "pointer", "document"} instead of the bare document.',
+  )
+  parser.add_argument("--output", type=Path, help="Write NDJSON to this file instead of stdout.")
+  return parser.parse_args()
+
+
+def main() -> int:
+  args = parse_args()
+  store = LazySchemaStore()
+  try:
+    schema_id = resolve_schema_id(args.schema, store)
+  except KeyError:
+    print(f"Unknown schema: {args.schema}", file=sys.stderr)
+    return 1
+
+  generator = DocumentGenerator(
+    store,
+    schema_id,
+    max_items=max(0, args.max_items),
+    max_string_length=max(1, args.max_string_length),
+    optional_rate=args.optional_rate,
+  )
+  output = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+  try:
+    for document, defect in iter_documents(generator, max(0, args.count), args.seed, args.invalid_rate):
+      if args.annotate:
+        document = {
+          "valid": defect is None,
+          "defect": defect[0] if defect else None,
+          "pointer": defect[1] if defect else None,
+          "document": document,
+        }
+      output.write(dumps_line(document) + "\n")
+  finally:
+    if args.output:
+      output.close()
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -6,15 +6,15 @@ from __future__ import annotations
 import argparse
 import hashlib
 import secrets
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
 
 CHARSET = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
 BODY_LENGTH = 12
 GROUP_SIZE = 4
 
 
-def _generate_body() -> str:
-  return "".join(secrets.choice(CHARSET) for _ in range(BODY_LENGTH))
+def _generate_body(choice: Callable[[Sequence[str]], str] = secrets.choice) -> str:
+  return "".join(choice(CHARSET) for _ in range(BODY_LENGTH))
 
 
 def _checksum(body: str) -> str:
@@ -1,44 +1,124 @@
 #!/usr/bin/env python3
-"""Generate index.json and index.html for the HEYRY Tools schema registry."""
+"""Generate index.json, versions.json, and index.html for the HEYRY Tools schema registry."""
 
 from __future__ import annotations
 
 import argparse
-import json
+import re
 from pathlib import Path
 from textwrap import dedent
 
+from json_io import dumps_pretty, load_json
+from registry_catalog import build_catalog
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCHEMAS_ROOT = REPO_ROOT / "schemas"
 INDEX_JSON_PATH = REPO_ROOT / "index.json"
 INDEX_HTML_PATH = REPO_ROOT / "index.html"
+VERSIONS_JSON_PATH = REPO_ROOT / "versions.json"
 INDEX_SCHEMA_ID = "https://schema.heyry.tools/registry/index/v1/index.schema.json"
+VERSION_INDEX_SCHEMA_ID = "https://schema.heyry.tools/registry/version-index/v1/version-index.schema.json"
+STATUSES = ("draft", "in_review", "approved", "deprecated")
+SEMVER_PATTERN = re.compile(
+  r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$"
+)
 
 
-def load_schema_metadata() -> list[dict[str, str]]:
-  entries: list[dict[str, str]] = []
-  for schema_path in sorted(SCHEMAS_ROOT.rglob("*.schema.json")):
-    with schema_path.open("r", encoding="utf-8") as handle:
-      data = json.load(handle)
-
-    entry = {
-      "id": data["$id"],
-      "name": data["title"],
-      "domain": data["domain"],
-      "version": data["schema_version"],
-      "status": data["status"],
-      "path": str(schema_path.relative_to(REPO_ROOT).as_posix()),
-      "description": data["description"],
-    }
-    entries.append(entry)
+def build_entry(schema_path: Path, data: dict) -> dict[str, str]:
+  return {
+    "id": data["$id"],
+    "name": data["title"],
+    "domain": data["domain"],
+    "version": data["schema_version"],
+    "status": data["status"],
+    "path": str(schema_path.relative_to(REPO_ROOT).as_posix()),
+    "description": data["description"],
+  }
+
+
+def load_schemas() -> list[tuple[Path, dict]]:
+  return [(schema_path, load_json(schema_path)) for schema_path in sorted(SCHEMAS_ROOT.rglob("*.schema.json"))]
+
+
+def load_schema_metadata(schemas: list[tuple[Path, dict]] | None = None) -> list[dict[str, str]]:
+  if schemas is None:
+    schemas = load_schemas()
 
+  entries = [build_entry(schema_path, data) for schema_path, data in schemas]
   entries.sort(key=lambda item: item["id"])
   return entries
 
 
 def build_index_json(entries: list[dict[str, str]]) -> str:
   payload = {"$schema": INDEX_SCHEMA_ID, "schemas": entries}
-  return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+  return dumps_pretty(payload)
+
+
+def semver_key(version: str) -> tuple:
+  """Sort key implementing SemVer 2.0.0 precedence (build metadata is ignored)."""
+  match = SEMVER_PATTERN.match(version)
+  if match is None:
+    raise ValueError(f"Invalid semantic version: {version}")
+
+  major, minor, patch, prerelease = match.groups()
+  if prerelease is None:
+    release = (1,)
+  else:
+    identifiers = prerelease.split(".")
+    release = (0, tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in identifiers))
+  return (int(major), int(minor), int(patch), release)
+
+
+def build_version_index(entries: list[dict[str, str]]) -> dict:
+  """Precompute the newest version per family, major, and minor line for each status.
+
+  Prerelease versions are listed under ``versions`` but never selected as
+  "latest", so range lookups only ever resolve to releases. Raises
+  ``ValueError`` for a malformed version or a version defined twice.
+  """
+  versions: dict[str, dict[str, dict[str, str]]] = {}
+  for entry in entries:
+    family = "/".join(entry["path"].split("/")[1:3])
+    family_versions = versions.setdefault(family, {})
+    if SEMVER_PATTERN.match(entry["version"]) is None:
+      raise ValueError(f"{entry['path']}: invalid semantic version {entry['version']!r}")
+    if entry["version"] in family_versions:
+      existing = family_versions[entry["version"]]["path"]
+      raise ValueError(f"{entry['path']}: {family} {entry['version']} is already defined by {existing}")
+    family_versions[entry["version"]] = {"id": entry["id"], "status": entry["status"], "path": entry["path"]}
+
+  families: dict[str, dict] = {}
+  for family in sorted(versions):
+    ordered = sorted(versions[family], key=semver_key)
+    latest: dict[str, str] = {}
+    by_major: dict[str, dict[str, str]] = {}
+    by_minor: dict[str, dict[str, str]] = {}
+    for version in ordered:
+      major, minor, _, release = semver_key(version)
+      if release != (1,):
+        continue
+      status = versions[family][version]["status"]
+      latest[status] = version
+      by_major.setdefault(str(major), {})[status] = version
+      by_minor.setdefault(f"{major}.{minor}", {})[status] = version
+
+    def by_status(table: dict[str, str]) -> dict[str, str]:
+      return {status: table[status] for status in STATUSES if status in table}
+
+    families[family] = {
+      "versions": {version: versions[family][version] for version in reversed(ordered)},
+      "latest": by_status(latest),
+      "latest_by_major": {key: by_status(by_major[key]) for key in sorted(by_major, key=int)},
+      "latest_by_minor": {
+        key: by_status(by_minor[key]) for key in sorted(by_minor, key=lambda item: tuple(map(int, item.split("."))))
+      },
+    }
+
+  return {"$schema": VERSION_INDEX_SCHEMA_ID, "families": families}
+
+
+def build_versions_json(entries: list[dict[str, str]]) -> str:
+  return dumps_pretty(build_version_index(entries))
 
 
 def build_index_html() -> str:
@@ -425,16 +505,31 @@ def main() -> int:
   parser.add_argument(
     "--check",
     action="store_true",
-    help="Validate that index.json and index.html match the generated output without writing changes.",
+    help="Validate that index.json, versions.json, and index.html match the generated output without writing changes.",
+  )
+  parser.add_argument(
+    "--sqlite",
+    type=Path,
+    help="Also write a SQLite catalog (metadata, $ref edges, property paths, full-text search) to this path.",
   )
   args = parser.parse_args()
+  if args.check and args.sqlite is not None:
+    parser.error("--sqlite writes a catalog and cannot be combined with --check")
 
-  entries = load_schema_metadata()
+  schemas = load_schemas()
+  entries = load_schema_metadata(schemas)
   index_json = build_index_json(entries)
+  try:
+    versions_json = build_versions_json(entries)
+  except ValueError as exc:
+    raise SystemExit(str(exc)) from None
   index_html = build_index_html()
 
   write_or_check(INDEX_JSON_PATH, index_json, args.check)
+  write_or_check(VERSIONS_JSON_PATH, versions_json, args.check)
   write_or_check(INDEX_HTML_PATH, index_html, args.check)
+  if args.sqlite is not None:
+    build_catalog(args.sqlite, [(build_entry(schema_path, data), data) for schema_path, data in schemas])
   return 0
 
 
@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
-"""Generate HTML renderings of every HEYRY JSON Schema."""
+"""Generate HTML renderings of every HEYRY JSON Schema.
+
+Each page shows the schema as a collapsible tree whose nodes are rendered only
+when expanded. When a node's JSON exceeds ``CHUNK_BYTES``, its largest subtrees
+are written to separate JSON chunk files next to the page and fetched on first
+expand, and cross-schema ``$ref``s link to the target schema's page.
+"""
 
 from __future__ import annotations
 
 import argparse
 import html
 import json
+import shutil
 from pathlib import Path
 from textwrap import dedent
 
+from json_io import load_json
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCHEMAS_ROOT = REPO_ROOT / "schemas"
+SCHEMA_BASE_URL = "https://schema.heyry.tools/"
+CHUNK_BYTES = 16 * 1024
 
 HTML_TEMPLATE = dedent(
   """
@@ -28,7 +39,10 @@ HTML_TEMPLATE = dedent(
           --page-fg: #f5f7fb;
           --card-bg: #181b21;
           --border: #2a2f3a;
+          --accent: #63b3ed;
           --muted: #8b93a7;
+          --string: #68d391;
+          --number: #f6ad55;
         }}
 
         @media (prefers-color-scheme: light) {{
@@ -37,7 +51,10 @@ HTML_TEMPLATE = dedent(
             --page-fg: #0e1729;
             --card-bg: #ffffff;
             --border: #dce1ec;
+            --accent: #2563eb;
             --muted: #5f6b87;
+            --string: #2f855a;
+            --number: #dd6b20;
           }}
         }}
 
@@ -75,47 +92,294 @@ HTML_TEMPLATE = dedent(
           color: var(--muted);
         }}
 
-        pre {{
+        .tree {{
           margin: 0;
           padding: 1.25rem;
           background: rgba(255, 255, 255, 0.06);
           border: 1px solid var(--border);
           border-radius: 0.85rem;
           overflow-x: auto;
+        }}
+
+        .tree,
+        .tree ul {{
+          list-style: none;
+          font-family: "SFMono-Regular", Consolas, ui-monospace, Menlo, monospace;
+          font-size: 0.9rem;
+          line-height: 1.6;
+        }}
+
+        .tree ul {{
+          margin: 0;
+          padding-left: 1.25rem;
+          border-left: 1px dashed var(--border);
+        }}
+
+        .tree summary {{
+          cursor: pointer;
+        }}
+
+        .tree .key,
+        .tree .preview {{
+          color: var(--muted);
+        }}
+
+        .tree .value.string {{
+          color: var(--string);
           white-space: pre-wrap;
         }}
+
+        .tree .value.number,
+        .tree .value.boolean,
+        .tree .value.null {{
+          color: var(--number);
+        }}
+
+        .tree a {{
+          color: var(--accent);
+          font-weight: 600;
+        }}
+
+        .tree button {{
+          font: inherit;
+          color: var(--accent);
+          background: none;
+          border: 1px solid var(--border);
+          border-radius: 999px;
+          padding: 0.1rem 0.75rem;
+          cursor: pointer;
+        }}
       </style>
     </head>
     <body>
       <main>
         <h1>{title}</h1>
         <p class=\"meta\">Source: {source}</p>
-        <pre>{content}</pre>
+        <ul id=\"schema-tree\" class=\"tree\"></ul>
+        <noscript><p class=\"meta\">Enable JavaScript to browse this schema.</p></noscript>
       </main>
+      <script type=\"application/json\" id=\"schema-data\">{data}</script>
+      <script>{script}</script>
     </body>
   </html>
   """
 )
 
 
-def build_html(schema_path: Path, schema: dict[str, object], formatted_json: str) -> str:
-  title = str(schema.get("title", schema_path.stem))
-  escaped_json = html.escape(formatted_json)
-  source = schema_path.as_posix()
-  return HTML_TEMPLATE.format(title=title, content=escaped_json, source=source)
+TREE_SCRIPT = dedent(
+  """
+  (() => {
+    const BATCH_SIZE = 200;
+    const payload = JSON.parse(document.getElementById("schema-data").textContent);
+    const chunkRequests = new Map();
 
+    function escapeToken(key) {
+      return String(key).replace(/~/g, "~0").replace(/\\//g, "~1");
+    }
 
-def generate_html(schema_path: Path, output_root: Path) -> None:
-  with schema_path.open("r", encoding="utf-8") as handle:
-    schema = json.load(handle)
+    function loadNode(pointer, value) {
+      const chunk = payload.chunks[pointer];
+      if (!chunk) {
+        return Promise.resolve(value);
+      }
+      if (!chunkRequests.has(pointer)) {
+        const request = fetch(chunk.file).then((response) => {
+          if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+          }
+          return response.json();
+        });
+        request.catch(() => chunkRequests.delete(pointer));
+        chunkRequests.set(pointer, request);
+      }
+      return chunkRequests.get(pointer);
+    }
+
+    function describe(value, chunk) {
+      const isArray = chunk ? chunk.type === "array" : Array.isArray(value);
+      const count = chunk ? chunk.count : isArray ? value.length : Object.keys(value).length;
+      return isArray ? `[${count} item${count === 1 ? "" : "s"}]` : `{${count} key${count === 1 ? "" : "s"}}`;
+    }
+
+    function renderScalar(key, value) {
+      const span = document.createElement("span");
+      span.className = `value ${value === null ? "null" : typeof value}`;
+      if (key === "$ref" && typeof value === "string" && value.startsWith(payload.baseUrl)) {
+        const link = document.createElement("a");
+        const target = value.slice(payload.baseUrl.length).split("#")[0];
+        link.href = payload.refBase + target.replace(/\\.schema\\.json$/, ".schema.html");
+        link.textContent = JSON.stringify(value);
+        span.appendChild(link);
+      } else {
+        span.textContent = JSON.stringify(value);
+      }
+      return span;
+    }
+
+    function renderEntry(key, value, pointer, isIndex) {
+      const item = document.createElement("li");
+      const label = document.createElement("span");
+      label.className = "key";
+      label.textContent = `${isIndex ? key : JSON.stringify(key)}: `;
+
+      const chunk = payload.chunks[pointer];
+      if (!chunk && (value === null || typeof value !== "object")) {
+        item.append(label, renderScalar(key, value));
+        return item;
+      }
 
-  formatted_json = json.dumps(schema, ensure_ascii=False, indent=2) + "\n"
-  html_content = build_html(schema_path, schema, formatted_json)
+      const details = document.createElement("details");
+      const summary = document.createElement("summary");
+      const preview = document.createElement("span");
+      preview.className = "preview";
+      preview.textContent = describe(value, chunk);
+      summary.append(label, preview);
+      details.appendChild(summary);
+      details.addEventListener("toggle", () => {
+        if (!details.open || details.dataset.rendered) {
+          return;
+        }
+        details.dataset.rendered = "true";
+        const list = document.createElement("ul");
+        details.appendChild(list);
+        loadNode(pointer, value)
+          .then((node) => renderChildren(list, node, pointer, 0))
+          .catch((err) => {
+            list.textContent = `Unable to load this section (${err.message}). Collapse and expand to retry.`;
+            delete details.dataset.rendered;
+            details.addEventListener("toggle", () => list.remove(), { once: true });
+          });
+      });
+      item.appendChild(details);
+      return item;
+    }
+
+    function renderChildren(list, node, pointer, start) {
+      const isArray = Array.isArray(node);
+      const keys = isArray ? null : Object.keys(node);
+      const total = isArray ? node.length : keys.length;
+      const end = Math.min(total, start + BATCH_SIZE);
+      for (let index = start; index < end; index += 1) {
+        const key = isArray ? index : keys[index];
+        list.appendChild(renderEntry(key, node[key], `${pointer}/${escapeToken(key)}`, isArray));
+      }
+      if (end < total) {
+        const item = document.createElement("li");
+        const more = document.createElement("button");
+        more.type = "button";
+        more.textContent = `Show ${Math.min(BATCH_SIZE, total - end)} more of ${total - end}`;
+        more.addEventListener("click", () => {
+          item.remove();
+          renderChildren(list, node, pointer, end);
+        });
+        item.appendChild(more);
+        list.appendChild(item);
+      }
+    }
+
+    renderChildren(document.getElementById("schema-tree"), payload.root, "", 0);
+  })();
+  """
+)
+
+
+def _escape_pointer_token(token: str) -> str:
+  return token.replace("~", "~0").replace("/", "~1")
+
+
+def split_schema(schema: object, threshold: int = CHUNK_BYTES) -> tuple[object, dict[str, object]]:
+  """Detach subtrees so the page payload and every chunk stay near ``threshold`` bytes.
+
+  Returns the remaining tree (detached subtrees become ``null``) and the
+  detached subtrees keyed by JSON pointer. Splitting is bottom-up: when a node's
+  JSON exceeds ``threshold``, its largest object or array children are detached
+  one at a time until the rest fits, so a chunk never contains another chunk's
+  content and a node with many mid-sized children is not shipped as one piece.
+  Only long scalars and the key skeleton of very wide nodes can still exceed it.
+  """
+  chunks: dict[str, object] = {}
+
+  def visit(node: object, pointer: str) -> object:
+    if isinstance(node, dict):
+      children = [(key, f"{pointer}/{_escape_pointer_token(key)}") for key in node]
+      stripped: dict | list = {key: visit(node[key], child_pointer) for key, child_pointer in children}
+    elif isinstance(node, list):
+      children = [(index, f"{pointer}/{index}") for index in range(len(node))]
+      stripped = [visit(node[index], child_pointer) for index, child_pointer in children]
+    else:
+      return node
+
+    size = _json_size(stripped)
+    if size <= threshold:
+      return stripped
+
+    sizes = [
+      (_json_size(stripped[key]), key, child_pointer)
+      for key, child_pointer in children
+      if isinstance(stripped[key], (dict, list))
+    ]
+    sizes.sort(key=lambda item: item[0], reverse=True)
+    for child_size, key, child_pointer in sizes:
+      if size <= threshold:
+        break
+      chunks[child_pointer] = stripped[key]
+      stripped[key] = None
+      size -= child_size - len("null")
+    return stripped
+
+  return visit(schema, ""), chunks
+
+
+def _json_size(data: object) -> int:
+  return len(_compact_json(data).encode("utf-8"))
+
+
+def _compact_json(data: object) -> str:
+  return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _script_json(data: object) -> str:
+  """Serialize ``data`` for embedding inside a ``<script>`` element."""
+  return _compact_json(data).replace("</", "<\\/").replace("<!--", "<\\u0021--")
+
+
+def build_html(schema_path: Path, schema: dict[str, object], root: object, chunks: dict[str, dict[str, object]]) -> str:
+  title = html.escape(str(schema.get("title", schema_path.stem)))
+  source = html.escape(schema_path.as_posix())
+  depth = len(schema_path.relative_to(SCHEMAS_ROOT).parent.parts)
+  payload = {
+    "root": root,
+    "chunks": chunks,
+    "baseUrl": SCHEMA_BASE_URL,
+    "refBase": "../" * depth,
+  }
+  return HTML_TEMPLATE.format(title=title, source=source, data=_script_json(payload), script=TREE_SCRIPT)
+
+
+def generate_html(schema_path: Path, output_root: Path) -> None:
+  schema = load_json(schema_path)
+  root, detached = split_schema(schema)
 
   relative = schema_path.relative_to(SCHEMAS_ROOT)
   html_filename = relative.name.replace(".schema.json", ".schema.html")
   output_path = output_root / relative.parent / html_filename
+  chunk_dirname = relative.name.replace(".schema.json", ".schema.chunks")
+  chunk_dir = output_path.parent / chunk_dirname
   output_path.parent.mkdir(parents=True, exist_ok=True)
+  if chunk_dir.exists():
+    shutil.rmtree(chunk_dir)
+
+  chunks: dict[str, dict[str, object]] = {}
+  for number, (pointer, subtree) in enumerate(detached.items()):
+    chunk_dir.mkdir(exist_ok=True)
+    (chunk_dir / f"{number}.json").write_text(_compact_json(subtree), encoding="utf-8")
+    chunks[pointer] = {
+      "file": f"{chunk_dirname}/{number}.json",
+      "type": "array" if isinstance(subtree, list) else "object",
+      "count": len(subtree),
+    }
+
+  html_content = build_html(schema_path, schema, root, chunks)
   output_path.write_text(html_content, encoding="utf-8")
 
 
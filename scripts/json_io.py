@@ -0,0 +1,70 @@
+"""Shared JSON I/O helpers for the HEYRY Tools registry scripts.
+
+Files are read through a memory-mapped buffer and parsed with ``orjson`` when
+it is installed (set ``HEYRY_JSON_BACKEND=json`` to force the standard
+library). Serialization always goes through the standard library so the
+canonical pretty format stays byte-identical regardless of backend.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+try:  # pragma: no cover - optional dependency
+  import orjson
+except ImportError:  # pragma: no cover - optional dependency
+  orjson = None
+
+BACKEND_ENV_VAR = "HEYRY_JSON_BACKEND"
+BACKEND = "orjson" if orjson is not None and os.environ.get(BACKEND_ENV_VAR, "orjson") == "orjson" else "json"
+# Any run of 19+ digits may be an integer beyond the signed 64-bit range.
+_LONG_DIGITS_BYTES = re.compile(rb"[0-9]{19}")
+_LONG_DIGITS_TEXT = re.compile(r"[0-9]{19}")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+  """Parse JSON from bytes or text using the active backend."""
+  # orjson parses integers outside the 64-bit range as floats, which would change
+  # the canonical output; documents with such long digit runs go to the stdlib.
+  long_digits = _LONG_DIGITS_TEXT if isinstance(data, str) else _LONG_DIGITS_BYTES
+  if BACKEND == "orjson" and long_digits.search(data) is None:
+    try:
+      return orjson.loads(data)
+    except orjson.JSONDecodeError:
+      # orjson rejects some inputs the stdlib accepts (NaN, Infinity); re-parse
+      # with the stdlib so results and error messages match.
+      pass
+
+  if not isinstance(data, str):
+    data = str(data, "utf-8")
+  return json.loads(data)
+
+
+def load_json(path: Path) -> Any:
+  """Parse the JSON document stored at ``path``."""
+  with path.open("rb") as handle:
+    if os.fstat(handle.fileno()).st_size == 0:
+      return loads(b"")
+    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+      view = memoryview(mapped)
+      try:
+        return loads(view)
+      finally:
+        view.release()
+
+
+def dumps_pretty(data: Any) -> str:
+  """Serialize ``data`` in the registry's canonical pretty format."""
+  return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def dumps_line(data: Any) -> str:
+  """Serialize ``data`` compactly on one line (for NDJSON), using the active backend."""
+  if BACKEND == "orjson":
+    return orjson.dumps(data).decode("utf-8")
+  return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
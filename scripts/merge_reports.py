@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Merge per-shard validation reports into a single report."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from json_io import dumps_pretty, load_json
+from sharding import REPORT_VERSION
+
+
+def merge_reports(reports: list[dict]) -> tuple[dict, list[str]]:
+  """Combine shard reports; return the merged payload and any coverage problems."""
+  problems: list[str] = []
+  scripts: dict[str, dict[str, object]] = {}
+  for report in reports:
+    if report.get("version") != REPORT_VERSION:
+      problems.append(f"{report.get('script')}: unsupported report version {report.get('version')}")
+      continue
+
+    index, _, total = report["shard"].partition("/")
+    merged = scripts.setdefault(report["script"], {"total": int(total), "shards": set(), "results": {}})
+    if merged["total"] != int(total):
+      problems.append(f"{report['script']}: mixed shard counts ({merged['total']} and {total})")
+    if int(index) in merged["shards"]:
+      problems.append(f"{report['script']}: shard {report['shard']} reported more than once")
+    merged["shards"].add(int(index))
+    for result in report["results"]:
+      if result["path"] in merged["results"]:
+        problems.append(f"{report['script']}: {result['path']} validated by more than one shard")
+      merged["results"][result["path"]] = result
+
+  payload: dict[str, object] = {"version": REPORT_VERSION, "scripts": {}}
+  for script, merged in sorted(scripts.items()):
+    missing = sorted(set(range(1, merged["total"] + 1)) - merged["shards"])
+    if missing:
+      labels = ", ".join(f"{index}/{merged['total']}" for index in missing)
+      problems.append(f"{script}: missing shard(s) {labels}")
+    payload["scripts"][script] = [merged["results"][path] for path in sorted(merged["results"])]
+
+  return payload, problems
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("reports", nargs="+", type=Path, help="Shard report files written with --report.")
+  parser.add_argument("--output", type=Path, help="Write the merged report to this file.")
+  parser.add_argument(
+    "--write-costs",
+    type=Path,
+    help="Record per-file durations as a costs file for --shard-costs.",
+  )
+  return parser.parse_args()
+
+
+def main() -> int:
+  args = parse_args()
+  payload, problems = merge_reports([load_json(path) for path in args.reports])
+
+  failures = 0
+  for script, results in payload["scripts"].items():
+    failed = [result for result in results if result["status"] == "fail"]
+    failures += len(failed)
+    for result in failed:
+      print(f"FAIL {script} {result['path']}: {result['message']}")
+    print(f"{script}: {len(results) - len(failed)} passed, {len(failed)} failed")
+
+  for problem in problems:
+    print(f"ERROR {problem}")
+
+  if args.output is not None:
+    args.output.write_text(dumps_pretty(payload), encoding="utf-8")
+
+  if args.write_costs is not None:
+    costs: dict[str, float] = {}
+    for results in payload["scripts"].values():
+      for result in results:
+        costs[result["path"]] = round(costs.get(result["path"], 0.0) + result["seconds"], 6)
+    args.write_costs.write_text(dumps_pretty(dict(sorted(costs.items()))), encoding="utf-8")
+
+  if failures or problems:
+    return 1
+
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,144 @@
+"""Build a SQLite catalog of the HEYRY Tools schema registry.
+
+The catalog holds the index.json metadata plus ``owner_role``, ``heyry_id``,
+``$ref`` edges and property paths, with an FTS5 index over titles and
+descriptions. Example query for approved documents schemas that reference the
+HEYRY ID schema::
+
+  SELECT s.id FROM schemas AS s
+  JOIN schema_refs AS r ON r.source_id = s.id
+  WHERE s.domain = 'documents' AND s.status = 'approved'
+    AND r.target_id = 'https://schema.heyry.tools/core/heyry-id/v1/heyry-id.schema.json';
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin
+
+CATALOG_SCHEMA = """
+CREATE TABLE schemas (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  domain TEXT NOT NULL,
+  version TEXT NOT NULL,
+  status TEXT NOT NULL,
+  path TEXT NOT NULL,
+  description TEXT NOT NULL,
+  owner_role TEXT,
+  heyry_id TEXT
+);
+CREATE INDEX schemas_domain_status ON schemas (domain, status);
+CREATE INDEX schemas_heyry_id ON schemas (heyry_id);
+
+CREATE TABLE schema_refs (
+  source_id TEXT NOT NULL REFERENCES schemas (id),
+  target_id TEXT NOT NULL,
+  PRIMARY KEY (source_id, target_id)
+);
+CREATE INDEX schema_refs_target ON schema_refs (target_id);
+
+CREATE TABLE schema_properties (
+  schema_id TEXT NOT NULL REFERENCES schemas (id),
+  path TEXT NOT NULL,
+  PRIMARY KEY (schema_id, path)
+);
+CREATE INDEX schema_properties_path ON schema_properties (path);
+
+CREATE VIRTUAL TABLE schemas_fts USING fts5 (
+  name,
+  description,
+  content = 'schemas',
+  content_rowid = 'rowid'
+);
+"""
+SUBSCHEMA_LISTS = ("allOf", "anyOf", "oneOf")
+
+
+def collect_refs(node: object, base: str = "") -> set[str]:
+  """Return the schema URIs referenced anywhere inside ``node``, without fragments.
+
+  Relative ``$ref``s are resolved against the enclosing ``$id`` (or ``base``),
+  as ``RefResolver`` does; fragment-only refs point into the same document and
+  are skipped.
+  """
+  refs: set[str] = set()
+  stack = [(node, base)]
+  while stack:
+    current, scope = stack.pop()
+    if isinstance(current, dict):
+      if isinstance(current.get("$id"), str):
+        scope = urljoin(scope, current["$id"])
+      ref = current.get("$ref")
+      if isinstance(ref, str) and not ref.startswith("#"):
+        refs.add(urldefrag(urljoin(scope, ref))[0])
+      stack.extend((value, scope) for value in current.values())
+    elif isinstance(current, list):
+      stack.extend((value, scope) for value in current)
+  return refs
+
+
+def collect_property_paths(schema: object, prefix: str = "") -> set[str]:
+  """Return dotted property paths declared by ``schema`` (``[]`` marks array items).
+
+  ``$ref`` targets are not followed; they are recorded as edges instead.
+  """
+  paths: set[str] = set()
+  if not isinstance(schema, dict):
+    return paths
+
+  for name, subschema in schema.get("properties", {}).items():
+    path = f"{prefix}.{name}" if prefix else name
+    paths.add(path)
+    paths.update(collect_property_paths(subschema, path))
+
+  items = schema.get("items")
+  if isinstance(items, dict):
+    paths.update(collect_property_paths(items, f"{prefix}[]"))
+
+  for keyword in SUBSCHEMA_LISTS:
+    for subschema in schema.get(keyword, []):
+      paths.update(collect_property_paths(subschema, prefix))
+  return paths
+
+
+def build_catalog(path: Path, schemas: list[tuple[dict[str, str], dict]]) -> None:
+  """Write a fresh catalog for ``(index entry, schema data)`` pairs to ``path``."""
+  temporary = path.with_name(f"{path.name}.tmp")
+  temporary.unlink(missing_ok=True)
+  path.parent.mkdir(parents=True, exist_ok=True)
+
+  connection = sqlite3.connect(temporary)
+  try:
+    connection.executescript(CATALOG_SCHEMA)
+    with connection:
+      for entry, data in sorted(schemas, key=lambda item: item[0]["id"]):
+        connection.execute(
+          "INSERT INTO schemas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+          (
+            entry["id"],
+            entry["name"],
+            entry["domain"],
+            entry["version"],
+            entry["status"],
+            entry["path"],
+            entry["description"],
+            data.get("owner_role"),
+            data.get("heyry_id"),
+          ),
+        )
+        connection.executemany(
+          "INSERT INTO schema_refs VALUES (?, ?)",
+          ((entry["id"], target) for target in sorted(collect_refs(data, entry["id"]))),
+        )
+        connection.executemany(
+          "INSERT INTO schema_properties VALUES (?, ?)",
+          ((entry["id"], property_path) for property_path in sorted(collect_property_paths(data))),
+        )
+      connection.execute("INSERT INTO schemas_fts (schemas_fts) VALUES ('rebuild')")
+  finally:
+    connection.close()
+
+  os.replace(temporary, path)
@@ -0,0 +1,170 @@
+"""Memoized validation results keyed by schema and document content.
+
+A result is stored under ``(schema fingerprint, document digest)``. The schema
+fingerprint hashes the canonical JSON of the schema and of every schema it
+reaches through ``$ref``, together with the validator class and jsonschema
+version, so editing a schema or any of its dependencies changes the key and
+stale results are simply never looked up again. The document digest hashes
+the canonical JSON of the document, so formatting and key order do not matter.
+
+Results live in an in-memory LRU and, optionally, in a SQLite file shared
+between runs (and between concurrently running shards).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import weakref
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Callable
+
+from jsonschema import Draft7Validator
+
+from registry_catalog import collect_refs
+
+CACHE_FORMAT = 2
+DEFAULT_RESULT_CACHE_SIZE = 4096
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+  schema_hash TEXT NOT NULL,
+  document_hash TEXT NOT NULL,
+  failure TEXT,
+  PRIMARY KEY (schema_hash, document_hash)
+) WITHOUT ROWID;
+"""
+MISSING = object()
+
+
+def canonical_digest(data: object) -> str:
+  canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+  return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _jsonschema_version() -> str:
+  try:
+    return version("jsonschema")
+  except PackageNotFoundError:  # pragma: no cover - vendored or source installs
+    return "unknown"
+
+
+def schema_fingerprint(schema_id: str, schema: dict, load: Callable[[str], dict], validator_name: str) -> str:
+  """Hash ``schema`` together with its ``$ref`` dependency closure (``load`` fetches a schema by ``$id``)."""
+  closure = {schema_id: schema}
+  pending = sorted(collect_refs(schema, schema_id))
+  while pending:
+    ref = pending.pop()
+    if ref in closure:
+      continue
+    try:
+      closure[ref] = load(ref)
+    except KeyError:
+      # Unresolvable references fail validation on their own; they only need to be part of the key.
+      closure[ref] = None
+      continue
+    pending.extend(sorted(collect_refs(closure[ref], ref) - closure.keys()))
+
+  digest = hashlib.sha256(f"{CACHE_FORMAT}\0{validator_name}\0{_jsonschema_version()}".encode("utf-8"))
+  for ref in sorted(closure):
+    digest.update(f"\0{ref}\0{canonical_digest(closure[ref])}".encode("utf-8"))
+  return digest.hexdigest()
+
+
+class ValidationCache:
+  """LRU of validation results (``None`` for a pass, else the failure message) with an optional SQLite tier."""
+
+  def __init__(self, maxsize: int = DEFAULT_RESULT_CACHE_SIZE, path: Path | None = None) -> None:
+    self.maxsize = maxsize
+    self.hits = 0
+    self.misses = 0
+    self._results: OrderedDict[tuple[str, str], str | None] = OrderedDict()
+    # Fingerprints keyed by id(validator). Only a weak reference is kept, so validators evicted by their
+    # owner's bound are freed, and the entry is dropped with them before the id can be reused.
+    self._fingerprints: dict[int, tuple[weakref.ref[Draft7Validator], str]] = {}
+    self._connection: sqlite3.Connection | None = None
+    if path is not None:
+      path.parent.mkdir(parents=True, exist_ok=True)
+      self._connection = sqlite3.connect(path, timeout=30)
+      # WAL lets readers proceed while another process writes; with it, NORMAL sync keeps commits cheap.
+      self._connection.execute("PRAGMA journal_mode=WAL")
+      self._connection.execute("PRAGMA synchronous=NORMAL")
+      self._connection.executescript(RESULTS_SCHEMA)
+
+  def __enter__(self) -> ValidationCache:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
+
+  def close(self) -> None:
+    if self._connection is not None:
+      self._connection.close()
+      self._connection = None
+
+  def fingerprint(self, schema_id: str, validator: Draft7Validator, load: Callable[[str], dict]) -> str:
+    key = id(validator)
+    cached = self._fingerprints.get(key)
+    if cached is None or cached[0]() is not validator:
+      # A rebuilt validator means its schema (or a dependency) may have changed, so hash it again.
+      fingerprint = schema_fingerprint(schema_id, validator.schema, load, type(validator).__name__)
+      reference = weakref.ref(validator, lambda _, key=key: self._fingerprints.pop(key, None))
+      cached = self._fingerprints[key] = (reference, fingerprint)
+    return cached[1]
+
+  def get(self, schema_hash: str, document_hash: str) -> str | None | object:
+    """Return the cached result, or ``MISSING`` when the pair has not been validated yet."""
+    key = (schema_hash, document_hash)
+    result = self._results.get(key, MISSING)
+    if result is not MISSING:
+      self._results.move_to_end(key)
+    elif self._connection is not None:
+      row = self._connection.execute(
+        "SELECT failure FROM results WHERE schema_hash = ? AND document_hash = ?",
+        key,
+      ).fetchone()
+      if row is not None:
+        result = row[0]
+        self._remember(key, result)
+
+    if result is MISSING:
+      self.misses += 1
+    else:
+      self.hits += 1
+    return result
+
+  def put(self, schema_hash: str, document_hash: str, failure: str | None) -> None:
+    key = (schema_hash, document_hash)
+    self._remember(key, failure)
+    if self._connection is not None:
+      # Commit every write so the lock is never held across validations of other documents.
+      with self._connection:
+        self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (*key, failure))
+
+  def _remember(self, key: tuple[str, str], failure: str | None) -> None:
+    if self.maxsize <= 0:
+      return
+    self._results[key] = failure
+    self._results.move_to_end(key)
+    while len(self._results) > self.maxsize:
+      self._results.popitem(last=False)
+
+  def validate(
+    self,
+    schema_id: str,
+    validator: Draft7Validator,
+    load: Callable[[str], dict],
+    document: object,
+    check: Callable[[Draft7Validator, object], str | None],
+  ) -> str | None:
+    """Return the cached result for ``document``, running ``check`` and storing its result on a miss."""
+    schema_hash = self.fingerprint(schema_id, validator, load)
+    document_hash = canonical_digest(document)
+    result = self.get(schema_hash, document_hash)
+    if result is MISSING:
+      result = check(validator, document)
+      self.put(schema_hash, document_hash, result)
+    return result
+
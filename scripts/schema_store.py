@@ -0,0 +1,79 @@
+"""On-demand schema loading for the validation scripts."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urldefrag
+
+from json_io import load_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMAS_ROOT = REPO_ROOT / "schemas"
+INDEX_JSON_PATH = REPO_ROOT / "index.json"
+SCHEMA_BASE_URL = "https://schema.heyry.tools/"
+DEFAULT_CACHE_SIZE = 128
+
+
+def find_schema_path(schema_uri: str) -> Path:
+  if not schema_uri.startswith(SCHEMA_BASE_URL):
+    raise FileNotFoundError(f"Unsupported schema URI: {schema_uri}")
+  relative = schema_uri.replace(SCHEMA_BASE_URL, "")
+  return SCHEMAS_ROOT / relative
+
+
+class LazySchemaStore:
+  """Schemas keyed by ``$id``, parsed on first access and kept in a bounded LRU cache.
+
+  ``$id``s are mapped to files through index.json, falling back to the
+  ``$id``-to-path convention for schemas the index does not list yet.
+  ``maxsize=None`` disables eviction.
+  """
+
+  def __init__(self, maxsize: int | None = DEFAULT_CACHE_SIZE, index_path: Path = INDEX_JSON_PATH) -> None:
+    self.maxsize = maxsize
+    self.index_path = index_path
+    self._paths: dict[str, Path] | None = None
+    self._schemas: OrderedDict[str, dict] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self._schemas)
+
+  def path_for(self, schema_id: str) -> Path:
+    if self._paths is None:
+      self._paths = {}
+      if self.index_path.exists():
+        for entry in load_json(self.index_path)["schemas"]:
+          self._paths[entry["id"]] = REPO_ROOT / entry["path"]
+
+    path = self._paths.get(schema_id)
+    if path is None or not path.exists():
+      path = find_schema_path(schema_id)
+    return path
+
+  def __getitem__(self, schema_uri: str) -> dict:
+    schema_id = urldefrag(schema_uri)[0]
+    schema = self._schemas.get(schema_id)
+    if schema is not None:
+      self._schemas.move_to_end(schema_id)
+      return schema
+
+    try:
+      path = self.path_for(schema_id)
+    except FileNotFoundError:
+      raise KeyError(schema_id) from None
+    if not path.exists():
+      raise KeyError(schema_id)
+
+    schema = load_json(path)
+    self.put(schema_id, schema)
+    return schema
+
+  def put(self, schema_id: str, schema: dict) -> None:
+    self._schemas[schema_id] = schema
+    self._schemas.move_to_end(schema_id)
+    while self.maxsize is not None and len(self._schemas) > self.maxsize:
+      self._schemas.popitem(last=False)
+
+  def discard(self, schema_id: str) -> None:
+    self._schemas.pop(schema_id, None)
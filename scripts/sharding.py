@@ -0,0 +1,135 @@
+"""Deterministic sharding and mergeable reports for the validation scripts.
+
+Every shard sees the same sorted file list and assigns files greedily (largest
+cost first) to the least-loaded shard, breaking ties with a stable hash of the
+repository-relative path. File cost defaults to the size in bytes; a costs
+file recorded by ``merge_reports.py --write-costs`` can be supplied instead so
+shards balance on measured validation time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from json_io import dumps_pretty, load_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+REPORT_VERSION = 1
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+  """Parse ``i/N`` (1-based) into ``(i, N)``; used as an argparse ``type``."""
+  index, _, total = value.partition("/")
+  try:
+    shard = (int(index), int(total))
+  except ValueError:
+    raise argparse.ArgumentTypeError(f"shard must look like i/N (got {value!r})") from None
+
+  if shard[1] < 1 or not 1 <= shard[0] <= shard[1]:
+    raise argparse.ArgumentTypeError(f"shard index must be between 1 and N (got {value!r})")
+  return shard
+
+
+def add_shard_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    default=(1, 1),
+    metavar="i/N",
+    help="Only process the i-th of N deterministic shards (default: 1/1).",
+  )
+  parser.add_argument(
+    "--shard-costs",
+    type=Path,
+    help="JSON file mapping repository-relative paths to recorded costs used to balance shards.",
+  )
+  parser.add_argument(
+    "--report",
+    type=Path,
+    help="Write a JSON report of per-file results that merge_reports.py can combine.",
+  )
+
+
+def _relative(path: Path) -> str:
+  return path.resolve().relative_to(REPO_ROOT).as_posix()
+
+
+def _stable_hash(relative: str) -> int:
+  return int.from_bytes(hashlib.sha256(relative.encode("utf-8")).digest()[:8], "big")
+
+
+def load_costs(path: Path | None) -> dict[str, float]:
+  if path is None:
+    return {}
+  return {str(key): float(value) for key, value in load_json(path).items()}
+
+
+def select_shard(paths: Iterable[Path], shard: tuple[int, int], costs: dict[str, float] | None = None) -> list[Path]:
+  """Return the subset of ``paths`` assigned to ``shard``, in the input order."""
+  paths = list(paths)
+  index, total = shard
+  if total == 1:
+    return paths
+
+  relatives = {path: _relative(path) for path in paths}
+  if costs:
+    recorded = [costs[relative] for relative in relatives.values() if relative in costs]
+    default_cost = sum(recorded) / len(recorded) if recorded else 1.0
+    cost_of = {path: costs.get(relative, default_cost) for path, relative in relatives.items()}
+  else:
+    cost_of = {path: float(path.stat().st_size) for path in paths}
+
+  loads = [0.0] * total
+  assigned: set[Path] = set()
+  for path in sorted(paths, key=lambda item: (-cost_of[item], _stable_hash(relatives[item]), relatives[item])):
+    target = min(range(total), key=lambda slot: (loads[slot], slot))
+    loads[target] += cost_of[path]
+    if target == index - 1:
+      assigned.add(path)
+
+  return [path for path in paths if path in assigned]
+
+
+class ShardReport:
+  """Collects per-file results and timings for one script run on one shard."""
+
+  def __init__(self, script: str, shard: tuple[int, int]) -> None:
+    self.script = script
+    self.shard = shard
+    self.results: list[dict[str, object]] = []
+
+  def timed(self, paths: Iterable[Path]) -> Iterator[Path]:
+    """Yield each path and record how long the caller spent on it."""
+    for path in paths:
+      started = time.perf_counter()
+      yield path
+      duration = time.perf_counter() - started
+      if self.results and self.results[-1]["path"] == _relative(path):
+        self.results[-1]["seconds"] = round(duration, 6)
+
+  def record(self, path: Path, failure: str | None) -> None:
+    self.results.append(
+      {
+        "path": _relative(path),
+        "status": "fail" if failure is not None else "pass",
+        "message": failure,
+        "seconds": 0.0,
+      }
+    )
+
+  def write(self, path: Path | None) -> None:
+    if path is None:
+      return
+
+    payload = {
+      "version": REPORT_VERSION,
+      "script": self.script,
+      "shard": f"{self.shard[0]}/{self.shard[1]}",
+      "results": self.results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(dumps_pretty(payload), encoding="utf-8")
@@ -0,0 +1,345 @@
+"""Incremental validation of large JSON documents with bounded memory.
+
+The document is read in chunks and walked alongside its schema. Objects and
+arrays whose schema only uses structural keywords (``type``, ``properties``,
+``required``, ``additionalProperties``, ``items``, size limits) are streamed:
+each property value or array item is validated as soon as it has been read and
+is then discarded. Any other subschema (``allOf``, ``enum``, ``oneOf``, ...)
+falls back to materializing just that subtree and validating it with the
+regular ``Draft7Validator``, so results match non-streaming validation while
+peak memory is bounded by the largest such subtree rather than the document.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Iterator, NamedTuple, TextIO
+from urllib.parse import urldefrag, urljoin
+
+from jsonschema import Draft7Validator
+
+CHUNK_SIZE = 1 << 16
+MATERIALIZED_KEYWORDS = frozenset(
+  (
+    "additionalItems",
+    "allOf",
+    "anyOf",
+    "const",
+    "contains",
+    "dependencies",
+    "else",
+    "enum",
+    "if",
+    "not",
+    "oneOf",
+    "patternProperties",
+    "propertyNames",
+    "then",
+  )
+)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR = re.compile(r"[-+.0-9Eaeflnrstu]*")
+
+
+class StreamDecodeError(ValueError):
+  """Raised when the streamed document is not valid JSON."""
+
+
+class StreamError(NamedTuple):
+  pointer: str
+  message: str
+
+  def __str__(self) -> str:
+    return f"{self.pointer or '(root)'}: {self.message}"
+
+
+def _escape(token: str) -> str:
+  return token.replace("~", "~0").replace("/", "~1")
+
+
+def _normalize(value: object) -> object:
+  """Map integral floats to ints so hashing follows jsonschema's equality (``1 == 1.0``)."""
+  if isinstance(value, float) and value.is_integer():
+    return int(value)
+  if isinstance(value, dict):
+    return {key: _normalize(item) for key, item in value.items()}
+  if isinstance(value, list):
+    return [_normalize(item) for item in value]
+  return value
+
+
+class _Reader:
+  """Pull parser over a text stream that keeps only unread input buffered."""
+
+  def __init__(self, handle: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+    self.handle = handle
+    self.chunk_size = chunk_size
+    self.buffer = ""
+    self.pos = 0
+    self.offset = 0
+
+  def _fill(self) -> bool:
+    chunk = self.handle.read(self.chunk_size)
+    if not chunk:
+      return False
+    self.offset += self.pos
+    self.buffer = self.buffer[self.pos :] + chunk
+    self.pos = 0
+    return True
+
+  def error(self, message: str) -> StreamDecodeError:
+    return StreamDecodeError(f"{message} at char {self.offset + self.pos}")
+
+  def peek(self) -> str:
+    """Skip whitespace and return the next character ("" at end of input)."""
+    while True:
+      self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+      if self.pos < len(self.buffer):
+        return self.buffer[self.pos]
+      if not self._fill():
+        return ""
+
+  def expect(self, char: str) -> None:
+    if self.peek() != char:
+      raise self.error(f"expected {char!r}")
+    self.pos += 1
+
+  def read_string(self) -> str:
+    scan = self.pos + 1
+    while True:
+      end = self.buffer.find('"', scan)
+      if end == -1:
+        scan = len(self.buffer) - self.pos
+        if not self._fill():
+          raise self.error("unterminated string")
+        continue
+
+      backslashes = 0
+      while self.buffer[end - 1 - backslashes] == "\\":
+        backslashes += 1
+      if backslashes % 2 == 0:
+        break
+      scan = end + 1
+
+    literal = self.buffer[self.pos : end + 1]
+    try:
+      value = json.loads(literal)
+    except json.JSONDecodeError as exc:
+      raise self.error(f"invalid string ({exc.msg})") from None
+    self.pos = end + 1
+    return value
+
+  def read_scalar(self) -> object:
+    while True:
+      end = _SCALAR.match(self.buffer, self.pos).end()
+      if end < len(self.buffer) or not self._fill():
+        break
+
+    token = self.buffer[self.pos : end]
+    try:
+      value = json.loads(token)
+    except json.JSONDecodeError:
+      raise self.error(f"invalid value {token[:20]!r}" if token else "unexpected character") from None
+    self.pos = end
+    return value
+
+  def iter_object(self) -> Iterator[str]:
+    """Consume ``{`` and yield each key with the reader positioned at its value."""
+    self.expect("{")
+    if self.peek() == "}":
+      self.pos += 1
+      return
+    while True:
+      if self.peek() != '"':
+        raise self.error("expected property name")
+      key = self.read_string()
+      self.expect(":")
+      yield key
+      char = self.peek()
+      if char not in (",", "}"):
+        raise self.error("expected ',' or '}'")
+      self.pos += 1
+      if char == "}":
+        return
+
+  def iter_array(self) -> Iterator[int]:
+    """Consume ``[`` and yield each index with the reader positioned at the item."""
+    self.expect("[")
+    if self.peek() == "]":
+      self.pos += 1
+      return
+    index = 0
+    while True:
+      yield index
+      index += 1
+      char = self.peek()
+      if char not in (",", "]"):
+        raise self.error("expected ',' or ']'")
+      self.pos += 1
+      if char == "]":
+        return
+
+  def read_value(self) -> object:
+    char = self.peek()
+    if char == "{":
+      return {key: self.read_value() for key in self.iter_object()}
+    if char == "[":
+      return [self.read_value() for _ in self.iter_array()]
+    if char == '"':
+      return self.read_string()
+    if not char:
+      raise self.error("unexpected end of document")
+    return self.read_scalar()
+
+  def skip_value(self) -> None:
+    char = self.peek()
+    if char == "{":
+      for _ in self.iter_object():
+        self.skip_value()
+    elif char == "[":
+      for _ in self.iter_array():
+        self.skip_value()
+    else:
+      self.read_value()
+
+
+def read_schema_uri(handle: TextIO, chunk_size: int = CHUNK_SIZE) -> str | None:
+  """Return the top-level ``$schema`` of a document without materializing it."""
+  reader = _Reader(handle, chunk_size)
+  if reader.peek() != "{":
+    return None
+  for key in reader.iter_object():
+    if key == "$schema":
+      value = reader.read_value()
+      return value if isinstance(value, str) else None
+    reader.skip_value()
+  return None
+
+
+class StreamingValidator:
+  """Validate a document from a text stream against ``validator``'s schema."""
+
+  def __init__(self, validator: Draft7Validator, chunk_size: int = CHUNK_SIZE) -> None:
+    self.validator = validator
+    self.chunk_size = chunk_size
+    self.resolver = validator.resolver
+    # Subschema validators keyed by id(); the schema is kept alongside so the id stays valid.
+    self._subvalidators: dict[int, tuple[object, Draft7Validator]] = {}
+
+  def iter_errors(self, handle: TextIO) -> Iterator[StreamError]:
+    reader = _Reader(handle, self.chunk_size)
+    yield from self._walk(reader, self.validator.schema, self.resolver.resolution_scope, "")
+    if reader.peek():
+      raise reader.error("extra data after document")
+
+  def _resolve(self, schema: object, base: str) -> tuple[object, str]:
+    """Follow ``$ref`` chains (siblings are ignored, as in draft-07)."""
+    while isinstance(schema, dict):
+      if "$ref" in schema:
+        url = urljoin(base, schema["$ref"])
+        base = urldefrag(url)[0]
+        schema = self.resolver.resolve_from_url(url)
+        continue
+      if isinstance(schema.get("$id"), str):
+        base = urljoin(base, schema["$id"])
+      break
+    return schema, base
+
+  def _streamable(self, schema: object, kind: str) -> bool:
+    if schema is True:
+      return True
+    if not isinstance(schema, dict) or MATERIALIZED_KEYWORDS.intersection(schema):
+      return False
+    if kind == "array" and not isinstance(schema.get("items", True), (dict, bool)):
+      return False
+    return True
+
+  def _check(self, schema: object, base: str, instance: object, pointer: str) -> list[StreamError]:
+    cached = self._subvalidators.get(id(schema))
+    if cached is None:
+      cached = self._subvalidators[id(schema)] = (schema, self.validator.evolve(schema=schema))
+
+    self.resolver.push_scope(base)
+    try:
+      errors = list(cached[1].iter_errors(instance))
+    finally:
+      self.resolver.pop_scope()
+    return [
+      StreamError(pointer + "".join(f"/{_escape(str(part))}" for part in error.absolute_path), error.message)
+      for error in errors
+    ]
+
+  def _walk(self, reader: _Reader, schema: object, base: str, pointer: str) -> Iterator[StreamError]:
+    schema, base = self._resolve(schema, base)
+    char = reader.peek()
+    kind = {"{": "object", "[": "array"}.get(char)
+    if kind is not None and self._streamable(schema, kind):
+      types = schema.get("type") if isinstance(schema, dict) else None
+      types = [types] if isinstance(types, str) else types
+      if types is not None and kind not in types:
+        yield StreamError(pointer, f"{kind} is not of type {', '.join(repr(item) for item in types)}")
+        reader.skip_value()
+      elif kind == "object":
+        yield from self._walk_object(reader, schema, base, pointer)
+      else:
+        yield from self._walk_array(reader, schema, base, pointer)
+      return
+
+    instance = reader.read_value()
+    yield from self._check(schema, base, instance, pointer)
+
+  def _walk_object(self, reader: _Reader, schema: object, base: str, pointer: str) -> Iterator[StreamError]:
+    schema = schema if isinstance(schema, dict) else {}
+    properties = schema.get("properties", {})
+    additional = schema.get("additionalProperties", True)
+    missing = list(schema.get("required", []))
+    count = 0
+    for key in reader.iter_object():
+      count += 1
+      if key in missing:
+        missing.remove(key)
+      child_pointer = f"{pointer}/{_escape(key)}"
+      if key in properties:
+        yield from self._walk(reader, properties[key], base, child_pointer)
+      elif additional is False:
+        yield StreamError(pointer, f"Additional properties are not allowed ({key!r} was unexpected)")
+        reader.skip_value()
+      else:
+        yield from self._walk(reader, additional, base, child_pointer)
+
+    for name in missing:
+      yield StreamError(pointer, f"{name!r} is a required property")
+    if "minProperties" in schema and count < schema["minProperties"]:
+      yield StreamError(pointer, f"object has {count} properties, fewer than minProperties {schema['minProperties']}")
+    if "maxProperties" in schema and count > schema["maxProperties"]:
+      yield StreamError(pointer, f"object has {count} properties, more than maxProperties {schema['maxProperties']}")
+
+  def _walk_array(self, reader: _Reader, schema: object, base: str, pointer: str) -> Iterator[StreamError]:
+    schema = schema if isinstance(schema, dict) else {}
+    items = schema.get("items", True)
+    # Only digests of previous items are kept to enforce uniqueItems.
+    digests: set[bytes] | None = set() if schema.get("uniqueItems") else None
+    count = 0
+    for index in reader.iter_array():
+      count += 1
+      child_pointer = f"{pointer}/{index}"
+      if digests is None:
+        yield from self._walk(reader, items, base, child_pointer)
+        continue
+
+      item = reader.read_value()
+      item_schema, item_base = self._resolve(items, base)
+      yield from self._check(item_schema, item_base, item, child_pointer)
+      canonical = json.dumps(_normalize(item), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+      digest = hashlib.sha256(canonical.encode("utf-8")).digest()
+      if digest in digests:
+        yield StreamError(child_pointer, "array has non-unique elements")
+      digests.add(digest)
+
+    if "minItems" in schema and count < schema["minItems"]:
+      yield StreamError(pointer, f"array has {count} items, fewer than minItems {schema['minItems']}")
+    if "maxItems" in schema and count > schema["maxItems"]:
+      yield StreamError(pointer, f"array has {count} items, more than maxItems {schema['maxItems']}")
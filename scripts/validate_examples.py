@@ -3,72 +3,184 @@
 
 from __future__ import annotations
 
-import json
+import argparse
 import sys
 from pathlib import Path
 
 from jsonschema import Draft7Validator, RefResolver, ValidationError
 
+from json_io import load_json
+from result_cache import DEFAULT_RESULT_CACHE_SIZE, ValidationCache
+from schema_store import DEFAULT_CACHE_SIZE, LazySchemaStore, find_schema_path
+from sharding import ShardReport, add_shard_arguments, load_costs, select_shard
+from stream_validate import StreamDecodeError, StreamingValidator, read_schema_uri
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
-SCHEMAS_ROOT = REPO_ROOT / "schemas"
 EXAMPLES_ROOT = REPO_ROOT / "examples"
-SCHEMA_BASE_URL = "https://schema.heyry.tools/"
-
-
-def load_json(path: Path):
-  with path.open("r", encoding="utf-8") as handle:
-    return json.load(handle)
-
 
-def build_schema_store() -> dict[str, dict]:
-  store: dict[str, dict] = {}
-  for schema_path in SCHEMAS_ROOT.rglob("*.schema.json"):
-    schema_data = load_json(schema_path)
-    schema_id = schema_data.get("$id")
-    if schema_id:
-      store[schema_id] = schema_data
-  return store
 
-
-def find_schema_path(schema_uri: str) -> Path:
-  if not schema_uri.startswith(SCHEMA_BASE_URL):
-    raise FileNotFoundError(f"Unsupported schema URI: {schema_uri}")
-  relative = schema_uri.replace(SCHEMA_BASE_URL, "")
-  return SCHEMAS_ROOT / relative
+def build_validator(schema_uri: str, schema_store: LazySchemaStore) -> Draft7Validator:
+  schema_data = schema_store[schema_uri]
+  # Remote references are fetched from the store, so only schemas actually reached by $ref get loaded.
+  # Neither the resolver's store nor its remote cache keeps them, so the store's LRU bound holds.
+  resolver = RefResolver(
+    base_uri=schema_uri,
+    referrer=schema_data,
+    cache_remote=False,
+    handlers={"http": schema_store.__getitem__, "https": schema_store.__getitem__},
+    remote_cache=lambda url: resolver.resolve_from_url(url),
+  )
+  return Draft7Validator(schema_data, resolver=resolver)
+
+
+def check_schema_uri(schema_uri: str | None) -> str | None:
+  if not schema_uri:
+    return "missing $schema property"
+
+  schema_path = find_schema_path(schema_uri)
+  if not schema_path.exists():
+    return f"schema not found at {schema_path.relative_to(REPO_ROOT)}"
+
+  return None
+
+
+def get_validator(
+  schema_uri: str,
+  schema_store: LazySchemaStore,
+  validators: dict[str, Draft7Validator] | None = None,
+) -> Draft7Validator:
+  """Return a validator for ``schema_uri``, reusing it from ``validators`` when given.
+
+  ``validators`` is kept in least-recently-used order and bounded by the
+  schema store's ``maxsize``, since each validator pins its root schema.
+  """
+  validator = validators.pop(schema_uri, None) if validators is not None else None
+  if validator is None:
+    validator = build_validator(schema_uri, schema_store)
+  if validators is not None:
+    validators[schema_uri] = validator
+    while schema_store.maxsize is not None and len(validators) > schema_store.maxsize:
+      del validators[next(iter(validators))]
+  return validator
+
+
+def first_failure(validator: Draft7Validator, example_data: dict) -> str | None:
+  try:
+    validator.validate(example_data)
+  except ValidationError as exc:
+    return exc.message
+
+  return None
+
+
+def validate_example(
+  example_data: dict,
+  schema_store: LazySchemaStore,
+  validators: dict[str, Draft7Validator] | None = None,
+  results: ValidationCache | None = None,
+) -> str | None:
+  """Return the reason ``example_data`` fails validation, or ``None`` if it passes.
+
+  When ``validators`` is provided, compiled validators are reused from (and
+  added to) it keyed by schema URI. When ``results`` is provided, documents
+  already validated against the same schema content are answered from it.
+  """
+  if not isinstance(example_data, dict):
+    return f"document must be a JSON object (found {type(example_data).__name__})"
+
+  schema_uri = example_data.get("$schema")
+  failure = check_schema_uri(schema_uri)
+  if failure is not None:
+    return failure
+
+  validator = get_validator(schema_uri, schema_store, validators)
+  if results is None:
+    return first_failure(validator, example_data)
+  return results.validate(schema_uri, validator, schema_store.__getitem__, example_data, first_failure)
+
+
+def stream_example(
+  example_path: Path,
+  schema_store: LazySchemaStore,
+  validators: dict[str, Draft7Validator] | None = None,
+) -> list[str]:
+  """Validate ``example_path`` incrementally and return every failure with its JSON pointer."""
+  with example_path.open("r", encoding="utf-8") as handle:
+    try:
+      schema_uri = read_schema_uri(handle)
+      failure = check_schema_uri(schema_uri)
+      if failure is not None:
+        return [failure]
+
+      handle.seek(0)
+      validator = get_validator(schema_uri, schema_store, validators)
+      return [str(error) for error in StreamingValidator(validator).iter_errors(handle)]
+    except StreamDecodeError as exc:
+      return [f"invalid JSON ({exc})"]
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Parse documents incrementally and report every error with its JSON pointer (bounded memory).",
+  )
+  parser.add_argument(
+    "--schema-cache-size",
+    type=int,
+    default=DEFAULT_CACHE_SIZE,
+    help=f"Maximum number of parsed schemas, and of compiled validators, kept in memory (default: {DEFAULT_CACHE_SIZE}).",
+  )
+  parser.add_argument(
+    "--result-cache-size",
+    type=int,
+    default=DEFAULT_RESULT_CACHE_SIZE,
+    help=f"Maximum number of validation results memoized in memory, 0 to disable (default: {DEFAULT_RESULT_CACHE_SIZE}).",
+  )
+  parser.add_argument(
+    "--result-cache",
+    type=Path,
+    help="SQLite file that keeps validation results between runs (ignored with --stream).",
+  )
+  add_shard_arguments(parser)
+  return parser.parse_args()
 
 
 def main() -> int:
-  schema_store = build_schema_store()
-  example_files = sorted(EXAMPLES_ROOT.rglob("*.json"))
+  args = parse_args()
+  schema_store = LazySchemaStore(max(1, args.schema_cache_size))
+  example_files = select_shard(sorted(EXAMPLES_ROOT.rglob("*.json")), args.shard, load_costs(args.shard_costs))
+  report = ShardReport("validate_examples", args.shard)
+
+  validators: dict[str, Draft7Validator] = {}
+  results = None
+  if not args.stream and (args.result_cache_size > 0 or args.result_cache is not None):
+    results = ValidationCache(args.result_cache_size, args.result_cache)
 
   has_error = False
-  for example_path in example_files:
-    example_data = load_json(example_path)
-    schema_uri = example_data.get("$schema")
-    if not schema_uri:
-      has_error = True
-      print(f"FAIL {example_path.relative_to(REPO_ROOT)}: missing $schema property")
-      continue
-
-    schema_path = find_schema_path(schema_uri)
-    if not schema_path.exists():
-      has_error = True
-      print(f"FAIL {example_path.relative_to(REPO_ROOT)}: schema not found at {schema_path.relative_to(REPO_ROOT)}")
-      continue
-
-    schema_data = load_json(schema_path)
-    resolver = RefResolver(base_uri=schema_uri, referrer=schema_data, store=schema_store)
-    validator = Draft7Validator(schema_data, resolver=resolver)
+  try:
+    for example_path in report.timed(example_files):
+      if args.stream:
+        failures = stream_example(example_path, schema_store, validators)
+      else:
+        failure = validate_example(load_json(example_path), schema_store, validators, results)
+        failures = [failure] if failure is not None else []
+
+      report.record(example_path, "; ".join(failures) if failures else None)
+      if failures:
+        has_error = True
+        for failure in failures:
+          print(f"FAIL {example_path.relative_to(REPO_ROOT)}: {failure}")
+        continue
 
-    try:
-      validator.validate(example_data)
-    except ValidationError as exc:
-      has_error = True
-      print(f"FAIL {example_path.relative_to(REPO_ROOT)}: {exc.message}")
-    else:
       print(f"PASS {example_path.relative_to(REPO_ROOT)}")
+  finally:
+    if results is not None:
+      results.close()
 
+  report.write(args.report)
   if has_error:
     return 1
 
@@ -3,13 +3,17 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
 import sys
 
+from json_io import dumps_pretty, loads
+from sharding import ShardReport, add_shard_arguments, load_costs, select_shard
+
 ROOT = Path(__file__).resolve().parents[1]
 JSON_DIRECTORIES = ("schemas", "examples")
-JSON_FILES = ("index.json",)
+JSON_FILES = ("index.json", "versions.json")
 
 
 def iter_json_files() -> list[Path]:
@@ -28,25 +32,34 @@ def iter_json_files() -> list[Path]:
 def validate_file(path: Path) -> tuple[bool, str | None]:
     current = path.read_text(encoding="utf-8")
     try:
-        data = json.loads(current)
+        data = loads(current)
     except json.JSONDecodeError as exc:  # pragma: no cover - deterministic reporting only
         return False, f"{path.relative_to(ROOT)}: invalid JSON ({exc})"
 
-    formatted = json.dumps(data, indent=2, ensure_ascii=False)
-    formatted += "\n"
+    formatted = dumps_pretty(data)
     if current != formatted:
         return False, f"{path.relative_to(ROOT)}: not pretty-formatted"
     return True, None
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_shard_arguments(parser)
+    return parser.parse_args()
+
+
 def main() -> int:
-    files = iter_json_files()
+    args = parse_args()
+    files = select_shard(iter_json_files(), args.shard, load_costs(args.shard_costs))
+    report = ShardReport("validate_pretty_format", args.shard)
     mismatches: list[str] = []
-    for file_path in files:
+    for file_path in report.timed(files):
         ok, message = validate_file(file_path)
+        report.record(file_path, None if ok else message)
         if not ok and message is not None:
             mismatches.append(message)
 
+    report.write(args.report)
     if mismatches:
         for message in mismatches:
             print(message)
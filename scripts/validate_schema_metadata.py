@@ -3,12 +3,15 @@
 
 from __future__ import annotations
 
-import json
+import argparse
 import sys
 from pathlib import Path
 
 from jsonschema import Draft7Validator, RefResolver, ValidationError
 
+from json_io import load_json
+from sharding import ShardReport, add_shard_arguments, load_costs, select_shard
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCHEMAS_ROOT = REPO_ROOT / "schemas"
@@ -21,12 +24,7 @@ HEYRY_ID_SCHEMA_ID = "https://schema.heyry.tools/core/heyry-id/v1/heyry-id.schem
 SEMVER_SCHEMA_ID = "https://schema.heyry.tools/core/semantic-version/v1/semantic-version.schema.json"
 
 
-def load_json(path: Path) -> dict:
-  with path.open("r", encoding="utf-8") as handle:
-    return json.load(handle)
-
-
-def main() -> int:
+def build_validator() -> Draft7Validator:
   meta_schema = load_json(META_SCHEMA_PATH)
   heyr_id_schema = load_json(HEYRY_ID_SCHEMA_PATH)
   semver_schema = load_json(SEMVER_SCHEMA_PATH)
@@ -37,64 +35,63 @@ def main() -> int:
       SEMVER_SCHEMA_ID: semver_schema,
     },
   )
-  validator = Draft7Validator(meta_schema, resolver=resolver)
+  return Draft7Validator(meta_schema, resolver=resolver)
 
-  schema_files = sorted(SCHEMAS_ROOT.rglob("*.schema.json"))
 
-  has_error = False
-  for schema_path in schema_files:
-    schema_data = load_json(schema_path)
+def validate_schema(schema_path: Path, schema_data: dict, validator: Draft7Validator) -> str | None:
+  """Return the reason ``schema_data`` fails the registry rules, or ``None`` if it passes."""
+  try:
+    validator.validate(schema_data)
+  except ValidationError as exc:
+    return exc.message
 
-    try:
-      validator.validate(schema_data)
-    except ValidationError as exc:
-      has_error = True
-      print(f"FAIL {schema_path.relative_to(REPO_ROOT)}: {exc.message}")
-      continue
+  if schema_data.get("$schema") != DRAFT_07_URI:
+    return f"$schema must be {DRAFT_07_URI}"
 
-    if schema_data.get("$schema") != DRAFT_07_URI:
-      has_error = True
-      print(
-        "FAIL",
-        schema_path.relative_to(REPO_ROOT),
-        f": $schema must be {DRAFT_07_URI}",
-      )
-      continue
+  relative_parts = schema_path.relative_to(SCHEMAS_ROOT).parts
+  if len(relative_parts) < 4:
+    return "schema path must follow schemas/<domain>/<schema-name>/v<major>/<schema-name>.schema.json"
 
-    relative_parts = schema_path.relative_to(SCHEMAS_ROOT).parts
-    if len(relative_parts) < 4:
-      has_error = True
-      print(
-        "FAIL",
-        schema_path.relative_to(REPO_ROOT),
-        ": schema path must follow schemas/<domain>/<schema-name>/v<major>/<schema-name>.schema.json",
-      )
-      continue
+  domain, schema_name, version_dir = relative_parts[:3]
+  expected_filename = f"{schema_name}.schema.json"
+  if relative_parts[3] != expected_filename:
+    return f"schema file must be named {expected_filename}"
+
+  expected_id = f"{SCHEMA_BASE_URL}/{domain}/{schema_name}/{version_dir}/{expected_filename}"
+  actual_id = schema_data.get("$id")
+  if actual_id != expected_id:
+    return f"$id must be {expected_id} (found {actual_id})"
+
+  return None
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__)
+  add_shard_arguments(parser)
+  return parser.parse_args()
 
-    domain, schema_name, version_dir = relative_parts[:3]
-    expected_filename = f"{schema_name}.schema.json"
-    if relative_parts[3] != expected_filename:
-      has_error = True
-      print(
-        "FAIL",
-        schema_path.relative_to(REPO_ROOT),
-        f": schema file must be named {expected_filename}",
-      )
-      continue
 
-    expected_id = f"{SCHEMA_BASE_URL}/{domain}/{schema_name}/{version_dir}/{expected_filename}"
-    actual_id = schema_data.get("$id")
-    if actual_id != expected_id:
+def main() -> int:
+  args = parse_args()
+  validator = build_validator()
+  schema_files = select_shard(
+    sorted(SCHEMAS_ROOT.rglob("*.schema.json")), args.shard, load_costs(args.shard_costs)
+  )
+  report = ShardReport("validate_schema_metadata", args.shard)
+
+  has_error = False
+  for schema_path in report.timed(schema_files):
+    schema_data = load_json(schema_path)
+    failure = validate_schema(schema_path, schema_data, validator)
+    report.record(schema_path, failure)
+    if failure is not None:
       has_error = True
-      print(
-        "FAIL",
-        schema_path.relative_to(REPO_ROOT),
-        f": $id must be {expected_id} (found {actual_id})",
-      )
+      print(f"FAIL {schema_path.relative_to(REPO_ROOT)}: {failure}")
       continue
 
     print(f"PASS {schema_path.relative_to(REPO_ROOT)}")
 
+  report.write(args.report)
   if has_error:
     return 1
 
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Watch schemas/ and examples/ and revalidate only the files affected by each change.
+
+Parsed schemas, compiled validators, validation results, and index entries
+stay in memory between polls. A changed schema is re-checked for formatting and
+metadata, every example whose schema is the changed schema or one of its
+``$ref`` dependents is revalidated, and index.json/versions.json/index.html are
+regenerated when their content changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import RefResolutionError, SchemaError, UnknownType
+
+import generate_index
+import validate_examples
+import validate_pretty_format
+import validate_schema_metadata
+from json_io import load_json
+from registry_catalog import collect_refs
+from result_cache import ValidationCache
+from schema_store import LazySchemaStore
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMAS_ROOT = REPO_ROOT / "schemas"
+EXAMPLES_ROOT = REPO_ROOT / "examples"
+METADATA_SCHEMA_PATHS = frozenset(
+  (
+    validate_schema_metadata.META_SCHEMA_PATH,
+    validate_schema_metadata.HEYRY_ID_SCHEMA_PATH,
+    validate_schema_metadata.SEMVER_SCHEMA_PATH,
+  )
+)
+
+
+def snapshot(paths: list[Path]) -> dict[Path, tuple[int, int]]:
+  stamps: dict[Path, tuple[int, int]] = {}
+  for path in paths:
+    try:
+      stat = path.stat()
+    except FileNotFoundError:
+      continue
+    stamps[path] = (stat.st_mtime_ns, stat.st_size)
+  return stamps
+
+
+class RegistryWatcher:
+  def __init__(self) -> None:
+    self.schema_ids: dict[Path, str] = {}
+    self.schema_store = LazySchemaStore(maxsize=None)
+    self.refs: dict[str, set[str]] = {}
+    self.index_entries: dict[Path, dict[str, str]] = {}
+    self.example_schemas: dict[Path, str | None] = {}
+    self.validators: dict[str, Draft7Validator] = {}
+    self.results = ValidationCache()
+    self.metadata_validator = validate_schema_metadata.build_validator()
+    self.failures: dict[tuple[str, Path], str] = {}
+    self.stamps: dict[Path, tuple[int, int]] = {}
+
+  def scan(self) -> dict[Path, tuple[int, int]]:
+    schema_files = sorted(SCHEMAS_ROOT.rglob("*.schema.json"))
+    example_files = sorted(EXAMPLES_ROOT.rglob("*.json"))
+    return snapshot(schema_files + example_files)
+
+  def dependents(self, schema_ids: set[str]) -> set[str]:
+    """Return ``schema_ids`` plus every schema that transitively ``$ref``s one of them."""
+    affected = set(schema_ids)
+    pending = list(schema_ids)
+    while pending:
+      target = pending.pop()
+      for source, targets in self.refs.items():
+        if target in targets and source not in affected:
+          affected.add(source)
+          pending.append(source)
+    return affected
+
+  def report(self, stage: str, path: Path, failure: str | None) -> None:
+    key = (stage, path)
+    relative = path.relative_to(REPO_ROOT)
+    if failure is None:
+      if self.failures.pop(key, None) is not None:
+        print(f"FIXED {stage} {relative}")
+      return
+
+    self.failures[key] = failure
+    print(f"FAIL {stage} {relative}: {failure}")
+
+  def check_format(self, path: Path) -> None:
+    ok, message = validate_pretty_format.validate_file(path)
+    # validate_file prefixes its message with the relative path; report() adds it back.
+    self.report("format", path, None if ok else str(message).partition(": ")[2])
+
+  def forget_schema(self, path: Path) -> str | None:
+    schema_id = self.schema_ids.pop(path, None)
+    self.index_entries.pop(path, None)
+    if schema_id is not None:
+      self.schema_store.discard(schema_id)
+      self.refs.pop(schema_id, None)
+    return schema_id
+
+  def load_schema(self, path: Path) -> set[str]:
+    """(Re)parse a schema and refresh everything derived from it.
+
+    Returns the schema's current and previous ``$id`` so callers can find dependents.
+    """
+    self.check_format(path)
+    try:
+      schema_data = load_json(path)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+      # Keep the last good copy in memory until the file parses again.
+      self.report("metadata", path, f"invalid JSON ({exc})")
+      return set()
+    if not isinstance(schema_data, dict):
+      self.report("metadata", path, f"schema must be a JSON object (found {type(schema_data).__name__})")
+      return set()
+
+    previous_id = self.forget_schema(path)
+    failure = validate_schema_metadata.validate_schema(path, schema_data, self.metadata_validator)
+    if failure is None:
+      try:
+        Draft7Validator.check_schema(schema_data)
+      except SchemaError as exc:
+        failure = f"not a valid draft-07 schema ({exc.message})"
+    self.report("metadata", path, failure)
+
+    schema_id = schema_data.get("$id")
+    if schema_id:
+      self.schema_ids[path] = schema_id
+      self.schema_store.put(schema_id, schema_data)
+      self.refs[schema_id] = collect_refs(schema_data, schema_id)
+    try:
+      self.index_entries[path] = generate_index.build_entry(path, schema_data)
+    except KeyError as exc:
+      self.report("index", path, f"missing {exc.args[0]} required for index.json")
+    else:
+      self.report("index", path, None)
+    return {value for value in (schema_id, previous_id) if value}
+
+  def check_example(self, path: Path) -> None:
+    self.check_format(path)
+    try:
+      example_data = load_json(path)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+      self.example_schemas[path] = None
+      self.report("examples", path, f"invalid JSON ({exc})")
+      return
+
+    if not isinstance(example_data, dict):
+      self.example_schemas[path] = None
+      self.report("examples", path, f"document must be a JSON object (found {type(example_data).__name__})")
+      return
+
+    self.example_schemas[path] = example_data.get("$schema")
+    try:
+      failure = validate_examples.validate_example(
+        example_data, self.schema_store, self.validators, self.results
+      )
+    except FileNotFoundError as exc:
+      failure = str(exc)
+    except RefResolutionError as exc:
+      failure = f"unresolvable $ref ({exc})"
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+      # Raised by the schema store when a referenced schema no longer parses.
+      failure = f"referenced schema is not valid JSON ({exc})"
+    # A half-edited schema (unknown type, broken pattern) fails its examples until it is fixed.
+    except UnknownType as exc:
+      failure = f"schema uses unknown type {exc.type!r}"
+    except re.error as exc:
+      failure = f"schema has an invalid pattern ({exc})"
+    except SchemaError as exc:
+      failure = f"schema is invalid ({exc.message})"
+    except TypeError as exc:
+      # Keyword values of the wrong type (e.g. "minProperties": "x") surface only while validating.
+      failure = f"schema is invalid ({exc})"
+    self.report("examples", path, failure)
+
+  def regenerate_index(self) -> None:
+    entries = sorted(self.index_entries.values(), key=lambda item: item["id"])
+    outputs = [(generate_index.INDEX_JSON_PATH, generate_index.build_index_json(entries))]
+    try:
+      outputs.append((generate_index.VERSIONS_JSON_PATH, generate_index.build_versions_json(entries)))
+    except ValueError as exc:
+      # Leave the last good versions.json in place until the version conflict is resolved.
+      self.report("index", generate_index.VERSIONS_JSON_PATH, str(exc))
+    else:
+      self.report("index", generate_index.VERSIONS_JSON_PATH, None)
+    outputs.append((generate_index.INDEX_HTML_PATH, generate_index.build_index_html()))
+
+    for path, content in outputs:
+      if not path.exists() or path.read_text(encoding="utf-8") != content:
+        path.write_text(content, encoding="utf-8")
+        print(f"WROTE {path.relative_to(REPO_ROOT)}")
+
+  def apply(self, changed: set[Path], removed: set[Path]) -> int:
+    """Process one batch of file changes and return the number of files rechecked."""
+    touched_ids: set[str] = set()
+    schema_changed = False
+    rechecked = 0
+    if (changed | removed) & METADATA_SCHEMA_PATHS:
+      self.metadata_validator = validate_schema_metadata.build_validator()
+      if self.schema_ids:
+        # Every schema is checked against the meta-schema, so all of them are affected.
+        changed = changed | set(self.schema_ids)
+
+    for path in sorted(changed | removed):
+      if path.is_relative_to(SCHEMAS_ROOT):
+        schema_changed = True
+        if path in removed:
+          schema_id = self.forget_schema(path)
+          if schema_id:
+            touched_ids.add(schema_id)
+          for stage in ("format", "metadata", "index"):
+            self.failures.pop((stage, path), None)
+        else:
+          touched_ids.update(self.load_schema(path))
+          rechecked += 1
+
+    affected_ids = self.dependents(touched_ids)
+    for schema_id in affected_ids:
+      self.validators.pop(schema_id, None)
+
+    examples = {path for path in changed if path.is_relative_to(EXAMPLES_ROOT)}
+    examples.update(path for path, schema_uri in self.example_schemas.items() if schema_uri in affected_ids)
+    for path in sorted(examples):
+      if path in removed or not path.exists():
+        continue
+      self.check_example(path)
+      rechecked += 1
+
+    for path in removed:
+      if path.is_relative_to(EXAMPLES_ROOT):
+        self.example_schemas.pop(path, None)
+        for stage in ("format", "examples"):
+          self.failures.pop((stage, path), None)
+
+    if schema_changed:
+      self.regenerate_index()
+    return rechecked
+
+  def poll(self) -> tuple[set[Path], set[Path]]:
+    current = self.scan()
+    changed = {path for path, stamp in current.items() if self.stamps.get(path) != stamp}
+    removed = set(self.stamps) - set(current)
+    self.stamps = current
+    return changed, removed
+
+  def run(self, interval: float) -> None:
+    started = time.perf_counter()
+    changed, _ = self.poll()
+    self.apply(changed, set())
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Watching {len(self.stamps)} file(s); initial check took {elapsed:.0f} ms with {len(self.failures)} failure(s).")
+
+    while True:
+      time.sleep(interval)
+      changed, removed = self.poll()
+      if not changed and not removed:
+        continue
+
+      started = time.perf_counter()
+      rechecked = self.apply(changed, removed)
+      elapsed = (time.perf_counter() - started) * 1000
+      status = "OK" if not self.failures else f"{len(self.failures)} failure(s)"
+      print(f"Rechecked {rechecked} file(s) in {elapsed:.0f} ms: {status}")
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument(
+    "--interval",
+    type=float,
+    default=0.2,
+    help="Seconds between filesystem polls (default: 0.2).",
+  )
+  return parser.parse_args()
+
+
+def main() -> int:
+  args = parse_args()
+  try:
+    RegistryWatcher().run(max(0.05, args.interval))
+  except KeyboardInterrupt:
+    pass
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
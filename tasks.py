@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from invoke import task
 
 VALIDATION_SCRIPTS = (
@@ -10,14 +12,45 @@ VALIDATION_SCRIPTS = (
   "scripts/validate_examples.py",
   "scripts/generate_index.py --check",
 )
+SHARDED_SCRIPTS = frozenset(
+  (
+    "scripts/validate_schema_metadata.py",
+    "scripts/validate_pretty_format.py",
+    "scripts/validate_examples.py",
+  )
+)
 
 
 def _run_script(ctx, script: str) -> None:
   ctx.run(f"python {script}", pty=False)
 
 
-@task(help={"scripts": "Comma-separated list of validation scripts to run instead of the defaults."})
-def check(ctx, scripts: str | None = None) -> None:
+def _shard_arguments(script: str, shard: str, report_dir: str | None, shard_costs: str | None) -> str:
+  arguments = f" --shard {shard}"
+  if shard_costs:
+    arguments += f" --shard-costs {shard_costs}"
+  if report_dir:
+    index, _, total = shard.partition("/")
+    report = Path(report_dir) / f"{Path(script).stem}-{index}-of-{total}.json"
+    arguments += f" --report {report.as_posix()}"
+  return arguments
+
+
+@task(
+  help={
+    "scripts": "Comma-separated list of validation scripts to run instead of the defaults.",
+    "shard": "Only validate the i-th of N deterministic shards, written as i/N.",
+    "report_dir": "Directory for per-shard JSON reports (merge them with scripts/merge_reports.py).",
+    "shard_costs": "JSON file of recorded per-file costs used to balance shards.",
+  }
+)
+def check(
+  ctx,
+  scripts: str | None = None,
+  shard: str | None = None,
+  report_dir: str | None = None,
+  shard_costs: str | None = None,
+) -> None:
   """Run all validation scripts (or a provided subset)."""
   targets = (
     tuple(script.strip() for script in scripts.split(",") if script.strip())
@@ -29,4 +62,26 @@ def check(ctx, scripts: str | None = None) -> None:
     raise ValueError("No validation scripts specified.")
 
   for script in targets:
-    _run_script(ctx, script)
+    if shard is None:
+      _run_script(ctx, script)
+    elif script in SHARDED_SCRIPTS:
+      _run_script(ctx, script + _shard_arguments(script, shard, report_dir, shard_costs))
+    elif shard.partition("/")[0] == "1":
+      # Whole-registry checks such as the index comparison run once, on the first shard.
+      _run_script(ctx, script)
+
+
+@task(help={"interval": "Seconds between filesystem polls (default: 0.2)."})
+def watch(ctx, interval: float = 0.2) -> None:
+  """Watch schemas/ and examples/ and revalidate only the affected files on change."""
+  _run_script(ctx, f"scripts/watch_registry.py --interval {interval}")
+
+
+@task(help={"output": "Bundle file to write (default: dist/heyry-schemas.bundle)."})
+def bundle(ctx, output: str | None = None) -> None:
+  """Pack every schema and the index.json metadata into one indexed bundle file."""
+  command = "python -m heyry_schemas.bundle build"
+  if output:
+    command += f" --output {output}"
+  ctx.run(command, pty=False)
+  ctx.run(f"python -m heyry_schemas.bundle verify {output or 'dist/heyry-schemas.bundle'}", pty=False)